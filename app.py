@@ -0,0 +1,858 @@
+"""Dashboard Google Search Console (uruchomienie: ``streamlit run app.py``)."""
+
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import partial, wraps
+
+import numpy as np
+import pandas as pd
+
+import streamlit as st
+from dateutil.relativedelta import relativedelta
+
+from gsc.anomaly import BASELINE_DAYS, RECENT_DAYS, detect_anomalies
+from gsc.cache import ResultCache, cache_key, memory_report, ttl_for
+from gsc.compare import compare_totals, entity_deltas, top_movers
+from gsc.cube import Cube
+from gsc.downsample import CHART_POINTS, downsample
+from gsc.fetch import SearchAnalyticsFetcher, property_store, site_data, transport_from_config
+from gsc.perf import PerfLog, current_trace, stage, timed, trace
+from gsc.portfolio import cross_site_top, load_site, portfolio_table, summarize_portfolio
+from gsc.prefetch import PREFETCH_SITES, Prefetcher, SiteUsage
+from gsc.registry import DatasetRegistry
+from gsc.search import SearchIndex
+from gsc.store import factorize
+from gsc.topk import page_rows
+from gsc.totals import PrefixSumIndex
+
+
+# Dane demonstracyjne kończą się tego dnia; dane z GSC - dzisiaj (``today()``)
+MOCK_TODAY = date(2025, 9, 30)
+
+PERIODS = {
+    "1month": ("Ostatni miesiąc", 1, "day"),
+    "3months": ("Kwartał (3 msc)", 3, "month"),
+    "12months": ("Ostatnie 12 msc", 12, "month"),
+    "16months": ("Ostatnie 16 msc", 16, "month"),
+}
+
+AGGREGATIONS = {"day": "Dziennie", "week": "Tygodniowo", "month": "Miesięcznie"}
+
+COMPARISONS = {"previous": "vs poprzedni okres", "year_ago": "vs rok wcześniej"}
+
+MOVER_DIMENSIONS = {"page": "Strona", "query": "Zapytanie"}
+
+VALUE_FILTERS = {"country": "Kraj", "device": "Urządzenie"}
+
+SORT_COLUMNS = {
+    "clicks": "Kliknięcia",
+    "impressions": "Wyświetlenia",
+    "ctr": "CTR",
+    "position": "Pozycja",
+    "clicks_delta": "Zmiana kliknięć",
+    "impressions_delta": "Zmiana wyświetleń",
+    "ctr_delta": "Zmiana CTR",
+    "position_delta": "Zmiana pozycji",
+}
+
+PAGE_SIZES = [25, 50, 100]
+
+EXPORT_FORMATS = {"csv": "CSV (gzip)", "parquet": "Parquet"}
+
+FILTER_MODES = {"contains": "zawiera", "prefix": "zaczyna się od", "regex": "wyrażenie regularne"}
+
+COLORS = ["#3b82f6", "#10b981", "#f59e0b", "#ef4444", "#8b5cf6"]
+
+TABLE_COLUMNS = {
+    "clicks": st.column_config.NumberColumn("Kliknięcia", format="%d"),
+    "impressions": st.column_config.NumberColumn("Wyświetlenia", format="%d"),
+    "ctr": st.column_config.NumberColumn("CTR", format="%.2f%%"),
+    "position": st.column_config.NumberColumn("Pozycja", format="%.1f"),
+}
+
+DELTA_COLUMNS = {
+    "clicks_delta": st.column_config.NumberColumn("Zmiana kliknięć", format="%+d"),
+    "impressions_delta": st.column_config.NumberColumn("Zmiana wyświetleń", format="%+d"),
+    "ctr_delta": st.column_config.NumberColumn("Zmiana CTR", format="%+.2f"),
+    "position_delta": st.column_config.NumberColumn("Zmiana pozycji", format="%+.1f"),
+}
+
+
+def init_state():
+    end = today()
+    defaults = {
+        "is_authenticated": False,
+        "sites": [],
+        "selected_site": "",
+        "date_start": end - relativedelta(months=3) + timedelta(days=1),
+        "date_end": end,
+        "selected_period": "custom",
+        "aggregation": "month",
+        "comparison": "previous",
+        "data": None,
+        "portfolio": False,
+        "page_filter": "",
+        "query_filter": "",
+        "country_filter": [],
+        "device_filter": [],
+        "filter_mode": "contains",
+        "alert_dimension": "page",
+        "export_format": "csv",
+        "chart_zoom": None,
+        "perf_debug": False,
+    }
+    for key, value in defaults.items():
+        st.session_state.setdefault(key, value)
+
+
+def gsc_config():
+    try:
+        return st.secrets.get("gsc")
+    except FileNotFoundError:
+        return None
+
+
+def today():
+    """Ostatni dzień danych: dziś przy połączeniu z GSC, ``MOCK_TODAY`` dla danych demonstracyjnych."""
+    return date.today() if gsc_config() else MOCK_TODAY
+
+
+@st.cache_resource
+def get_fetcher():
+    transport = transport_from_config(gsc_config())
+    return SearchAnalyticsFetcher(transport) if transport else None
+
+
+@st.cache_resource
+def get_warehouse():
+    # hurtownia, raporty i eksport ładują pyarrow.parquet - importowane dopiero po zalogowaniu
+    from gsc.warehouse import Warehouse
+
+    return Warehouse()
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+
+def cached(data, kind, compute, **params):
+    """Wynik z pamięci podręcznej procesu, kluczowany witryną, wersją danych i parametrami."""
+    key = cache_key(data["site"], data["version"], kind, **params)
+    end = today()
+    ttl = ttl_for(params.get("end", end), end)
+    return get_result_cache().get_or_compute(key, lambda: timed(kind, compute), ttl)
+
+
+def section(render):
+    """Sekcja dashboardu jako ``st.fragment``: jej własne widżety przeliczają tylko ją, nie cały skrypt.
+
+    Wejścia wspólne (zakres dat, porównanie, filtry) zmieniają się w pełnym przebiegu; wtedy sekcje,
+    których to nie dotyczy, biorą wyniki z pamięci podręcznej. Przebieg samego fragmentu jest
+    mierzony osobno i trafia do tego samego logu wydajności.
+    """
+    name = render.__name__.removeprefix("render_")
+
+    @st.fragment
+    @wraps(render)
+    def run(*args, **kwargs):
+        if current_trace() is not None:
+            with stage(name):
+                render(*args, **kwargs)
+            return
+        with trace(memory=st.session_state.perf_debug) as current, stage(name):
+            render(*args, **kwargs)
+        get_perf_log().record(current)
+
+    return run
+
+
+def handle_auth():
+    fetcher = get_fetcher()
+    st.session_state.is_authenticated = True
+    if fetcher:
+        st.session_state.sites = fetcher.transport.list_sites()
+    else:
+        # Symulacja autoryzacji OAuth
+        st.session_state.sites = ["https://example.com", "https://blog.example.com"]
+    prefetch_sites(st.session_state.sites)
+
+
+def handle_site_select(site):
+    get_site_usage().record(site)
+    st.session_state.selected_site = site
+    st.session_state.data = None
+    # kraje i urządzenia innej witryny mogą nie istnieć w nowej kostce
+    for dimension in VALUE_FILTERS:
+        st.session_state[f"{dimension}_filter"] = []
+
+
+def set_portfolio(enabled):
+    st.session_state.portfolio = enabled
+
+
+def set_period(period):
+    _, months, aggregation = PERIODS[period]
+    end = today()
+    st.session_state.date_start = end - relativedelta(months=months)
+    st.session_state.date_end = end
+    st.session_state.aggregation = aggregation
+    st.session_state.selected_period = period
+    st.session_state.chart_zoom = None
+
+
+def set_custom_period():
+    st.session_state.selected_period = "custom"
+    st.session_state.chart_zoom = None
+
+
+def set_chart_zoom(key):
+    """Zaznaczenie prostokątem na wykresie zawęża oś czasu do zaznaczonego okna."""
+    boxes = st.session_state[key].selection.box
+    if boxes:
+        start, end = sorted(pd.Timestamp(value).date() for value in boxes[0]["x"])
+        st.session_state.chart_zoom = (start, end)
+
+
+def reset_chart_zoom():
+    st.session_state.chart_zoom = None
+
+
+@st.cache_resource
+def get_perf_log():
+    """Czasy przebiegów wszystkich sesji (percentyle, eksport dla Prometheusa)."""
+    return PerfLog()
+
+
+@st.cache_resource
+def get_registry():
+    """Zbiory danych witryn wspólne dla wszystkich sesji."""
+    return DatasetRegistry()
+
+
+@st.cache_resource
+def get_prefetcher():
+    """Wątki rozgrzewające zbiory witryn w tle (wspólne dla wszystkich sesji)."""
+    return Prefetcher()
+
+
+@st.cache_resource
+def get_site_usage():
+    return SiteUsage()
+
+
+def prefetch_sites(sites):
+    """Po zalogowaniu: zbiory najczęściej używanych witryn (ostatnio oglądana pierwsza) budowane w tle."""
+    from gsc.warehouse import REFRESH_SECONDS
+
+    # zasoby tworzone tu, w wątku skryptu - wątki w tle dostają gotowe z cache_resource
+    for resource in (get_fetcher, get_warehouse, get_result_cache, get_registry, get_search_indexes):
+        resource()
+    prefetcher = get_prefetcher()
+    for priority, site in enumerate(get_site_usage().ranking(sites)[:PREFETCH_SITES]):
+        # witryna rozgrzana w czasie krótszym niż odstęp synchronizacji ma już aktualny zbiór
+        prefetcher.submit(site, partial(load_site_data, site), priority, max_age=REFRESH_SECONDS)
+
+
+def sync_site(fetcher, warehouse, site):
+    """Dociąga witrynę z GSC i zwraca wersję jej danych.
+
+    Pamięć podręczna traci wpisy witryny tylko wtedy, gdy dane naprawdę się
+    zmieniły - i tylko te ze starszych wersji; w pozostałych przypadkach
+    o świeżości wyników decyduje TTL.
+    """
+    from gsc.warehouse import HISTORY_MONTHS
+
+    end = today()
+    changed = warehouse.sync(fetcher, site, end - relativedelta(months=HISTORY_MONTHS), end, today=end)
+    version = warehouse.version(site)
+    if changed:
+        get_result_cache().invalidate(site, keep_version=version)
+    return version
+
+
+def load_site_data(site):
+    """Współdzielony, tylko do odczytu zbiór witryny (jeden na proces i wersję danych)."""
+    fetcher = get_fetcher()
+    if fetcher:
+        warehouse = get_warehouse()
+        version = sync_site(fetcher, warehouse, site)
+        return get_registry().get(site, version, lambda: build_site_data(
+            site, version, site_data(warehouse.snapshot_all(site))))
+    # Symulacja pobierania danych (powtarzalna per witryna, więc też współdzielona)
+    return get_registry().get(site, "mock", lambda: build_site_data(site, "mock", load_site(site)))
+
+
+def build_site_data(site, version, data):
+    data["site"] = site
+    data["version"] = version
+    data["totals"] = timed("prefix_sums", lambda: PrefixSumIndex(property_store(data)))
+    data["cube"] = timed("cube", lambda: Cube(data["time_series"]))
+    data["search"] = timed("search_index", lambda: build_search_indexes(data))
+    return data
+
+
+@st.cache_resource
+def get_search_indexes():
+    """Indeksy wyszukiwania per (witryna, wymiar) - żyją między synchronizacjami i rosną przyrostowo."""
+    return {}
+
+
+def build_search_indexes(data):
+    indexes = get_search_indexes()
+    store = data["time_series"]
+    for dimension, fallback in (("page", "top_pages"), ("query", "top_queries")):
+        values = store.columns[dimension] if dimension in store.dimensions else data[fallback][dimension]
+        index = indexes.setdefault((data["site"], dimension), SearchIndex())
+        index.extend(factorize(values)[1])
+    return {dimension: indexes[(data["site"], dimension)] for dimension in MOVER_DIMENSIONS}
+
+
+def regex_error(pattern):
+    try:
+        re.compile(pattern)
+    except re.error as exc:
+        return str(exc)
+    return None
+
+
+def active_filters():
+    """Aktywne filtry jako krotka do klucza cache; błędny regex jest pomijany.
+
+    Strony/zapytania to wzorce, kraje/urządzenia - posortowane krotki wartości.
+    """
+    mode = st.session_state.filter_mode
+    filters = tuple(
+        (dimension, pattern) for dimension in MOVER_DIMENSIONS
+        if (pattern := st.session_state.get(f"{dimension}_filter", ""))
+        and not (mode == "regex" and regex_error(pattern))
+    ) + tuple(
+        (dimension, tuple(sorted(values))) for dimension in VALUE_FILTERS
+        if (values := st.session_state.get(f"{dimension}_filter", []))
+    )
+    return (mode, filters) if filters else ()
+
+
+def cube_filters(data, filters, exclude=None):
+    """Filtry przełożone na maski nad etykietami wymiarów kostki."""
+    cube = data["cube"]
+    if not filters:
+        return {}
+    mode, conditions = filters
+    masks = {}
+    for dimension, condition in conditions:
+        if dimension not in cube.dimensions or dimension == exclude:
+            continue
+        if dimension in MOVER_DIMENSIONS:
+            masks[dimension] = data["search"][dimension].match(cube.labels(dimension), condition, mode)
+        else:
+            masks[dimension] = cube.indexes[dimension].value_mask(condition)
+    return masks
+
+
+def filtered_store(data):
+    """Szereg czasowy zawężony filtrami (bez filtrów - oryginał)."""
+    store = data["time_series"]
+    filters = active_filters()
+    if not cube_filters(data, filters):
+        return store
+    return cached(data, "filtered_store", lambda: store.take(data["cube"].mask(cube_filters(data, filters))),
+                  filters=filters)
+
+
+def summary_store(data):
+    """Szereg do sum i wykresów: z tabeli usługi, gdy filtry na to pozwalają, inaczej zawężona kostka.
+
+    Kostka (wymiary strony i zapytania) nie zawiera zanonimizowanych zapytań, więc bez filtrów stron
+    i zapytań - i przy filtrze tylko jednego z wymiarów kraj/urządzenie - sumy idą z tabeli usługi.
+    """
+    filters = active_filters()
+    masks = cube_filters(data, filters)
+    if not masks:
+        return property_store(data)
+    dimension = next(iter(masks))
+    store = property_store(data, dimension)
+    if len(masks) > 1 or dimension not in VALUE_FILTERS or dimension not in store.dimensions:
+        return filtered_store(data)
+    values = dict(filters[1])[dimension]
+    return cached(data, "property_store", lambda: store.take(np.isin(np.asarray(store.columns[dimension]), values)),
+                  filters=filters)
+
+
+def breakdown(data, dimension, fallback):
+    """Sumy per kraj/urządzenie w wybranym zakresie i filtrach (bez filtra samego wymiaru)."""
+    if dimension not in data["cube"].dimensions:
+        return data[fallback]
+    start, end = st.session_state.date_start, st.session_state.date_end
+    filters = active_filters()
+    masks = cube_filters(data, filters, exclude=dimension)
+    store = property_store(data, dimension)
+
+    def compute():
+        if masks or dimension not in store.dimensions:
+            return data["cube"].breakdown(dimension, masks, start, end)
+        # bez innych filtrów: pełne sumy usługi
+        frame = store.slice(start, end).totals_by(dimension)
+        return frame[frame["impressions"] > 0].reset_index(drop=True)
+
+    return cached(data, "breakdown", compute, dimension=dimension, start=start, end=end, filters=filters)
+
+
+def filtered_totals(data):
+    filters = active_filters()
+    if not cube_filters(data, filters):
+        return data["totals"]
+    return cached(data, "filtered_totals", lambda: PrefixSumIndex(summary_store(data)), filters=filters)
+
+
+def get_chart_data(data, columns):
+    """Punkty wykresu: po przybliżeniu dzienne dane okna, zawsze zmniejszone LTTB do ``CHART_POINTS``."""
+    if st.session_state.chart_zoom:
+        (start, end), aggregation = st.session_state.chart_zoom, "day"
+    else:
+        start, end, aggregation = st.session_state.date_start, st.session_state.date_end, st.session_state.aggregation
+    filters = active_filters()
+
+    def compute():
+        rollup = cached(data, "rollup", lambda: summary_store(data).slice(start, end).rollup(aggregation),
+                        start=start, end=end, aggregation=aggregation, filters=filters)
+        return downsample(rollup, columns, CHART_POINTS)
+
+    return cached(data, "chart", compute, start=start, end=end, aggregation=aggregation, filters=filters,
+                  columns=columns, points=CHART_POINTS)
+
+
+def format_int(value):
+    return f"{int(value):,}".replace(",", "\u00a0")
+
+
+def stat_card(column, title, value, change, inverse=False):
+    delta = None if np.isnan(change) else f"{change:+.1f}% {COMPARISONS[st.session_state.comparison]}"
+    column.metric(title, value, delta=delta, delta_color="inverse" if inverse else "normal")
+
+
+def dual_axis_chart(frame, left, right, reverse_right=False):
+    import plotly.graph_objects as go
+
+    left_column, left_name, left_color = left
+    right_column, right_name, right_color = right
+    figure = go.Figure()
+    # WebGL zamiast SVG - płynne także przy tysiącach punktów
+    figure.add_trace(go.Scattergl(x=frame["date"], y=frame[left_column], name=left_name, mode="lines",
+                                  line=dict(color=left_color, width=2)))
+    figure.add_trace(go.Scattergl(x=frame["date"], y=frame[right_column], name=right_name, mode="lines",
+                                  line=dict(color=right_color, width=2), yaxis="y2"))
+    figure.update_layout(
+        height=300,
+        margin=dict(l=0, r=0, t=10, b=0),
+        yaxis2=dict(overlaying="y", side="right", autorange="reversed" if reverse_right else True),
+        legend=dict(orientation="h", y=-0.25),
+        dragmode="select",
+        selectdirection="h",
+    )
+    return figure
+
+
+def render_time_chart(data, key, left, right, reverse_right=False):
+    frame = get_chart_data(data, (left[0], right[0]))
+    with stage("chart_payload", rows=len(frame)):
+        st.plotly_chart(dual_axis_chart(frame, left, right, reverse_right), width="stretch", key=key,
+                        on_select=partial(set_chart_zoom, key), selection_mode="box")
+
+
+def entity_table(data, dimension):
+    """Metryki i zmiany per strona/zapytanie dla bieżącego zakresu (niesortowane)."""
+    start, end, against = st.session_state.date_start, st.session_state.date_end, st.session_state.comparison
+    return cached(data, "entities",
+                  lambda: entity_deltas(filtered_store(data), dimension, start, end, against=against),
+                  dimension=dimension, start=start, end=end, against=against, filters=active_filters())
+
+
+@section
+def render_movers(data):
+    dimensions = [name for name in MOVER_DIMENSIONS if name in data["time_series"].dimensions]
+    if not dimensions:
+        return
+    st.subheader(f"Największe zmiany kliknięć {COMPARISONS[st.session_state.comparison]}")
+    for dimension in dimensions:
+        winners, losers = top_movers(entity_table(data, dimension))
+        columns = {dimension: MOVER_DIMENSIONS[dimension], "clicks": TABLE_COLUMNS["clicks"],
+                   "clicks_delta": DELTA_COLUMNS["clicks_delta"], "position_delta": DELTA_COLUMNS["position_delta"]}
+        winners_col, losers_col = st.columns(2)
+        for column, title, frame in ((winners_col, "Wzrosty", winners), (losers_col, "Spadki", losers)):
+            column.caption(f"{title} — {MOVER_DIMENSIONS[dimension].lower()}")
+            with stage("table_payload", rows=len(frame)):
+                column.dataframe(frame[list(columns)], hide_index=True, width="stretch", column_config=columns)
+
+
+@section
+def render_alerts(data):
+    """Strony/zapytania z nagłym spadkiem kliknięć, pozycji lub trendu w ostatnich dniach zakresu."""
+    dimensions = [name for name in MOVER_DIMENSIONS if name in data["time_series"].dimensions]
+    if not dimensions:
+        return
+    st.subheader("Alerty: nagłe spadki")
+    dimension = st.segmented_control("Wymiar alertów", dimensions, key="alert_dimension",
+                                     format_func=MOVER_DIMENSIONS.get, label_visibility="collapsed")
+    if dimension is None:
+        return
+    end, filters = st.session_state.date_end, active_filters()
+    alerts = cached(data, "anomalies", lambda: detect_anomalies(filtered_store(data), dimension, end),
+                    dimension=dimension, end=end, filters=filters)
+    if not len(alerts):
+        st.caption(f"Brak alertów w ostatnich {RECENT_DAYS} dniach zakresu.")
+        return
+    st.caption(f"Ostatnie {RECENT_DAYS} dni do {end:%d.%m.%Y} względem {BASELINE_DAYS} dni wcześniej, "
+               "od największej straty kliknięć.")
+    with stage("table_payload", rows=len(alerts)):
+        st.dataframe(alerts, hide_index=True, width="stretch", column_config={
+            dimension: MOVER_DIMENSIONS[dimension],
+            "baseline_clicks": st.column_config.NumberColumn("Kliknięcia/dzień (baza)", format="%.1f"),
+            "recent_clicks": st.column_config.NumberColumn("Kliknięcia/dzień (teraz)", format="%.1f"),
+            "lost_clicks": st.column_config.NumberColumn("Utracone kliknięcia", format="%d"),
+            "zscore": st.column_config.NumberColumn("Z-score", format="%.1f"),
+            "trend": st.column_config.NumberColumn("Trend", format="%+.0f%%"),
+            "baseline_position": st.column_config.NumberColumn("Pozycja (baza)", format="%.1f"),
+            "recent_position": st.column_config.NumberColumn("Pozycja (teraz)", format="%.1f"),
+            "position_delta": DELTA_COLUMNS["position_delta"],
+            "clicks_drop": st.column_config.CheckboxColumn("Spadek kliknięć"),
+            "position_drop": st.column_config.CheckboxColumn("Spadek pozycji"),
+            "declining": st.column_config.CheckboxColumn("Trend spadkowy"),
+        })
+
+
+@section
+def render_top_table(data, dimension, title, fallback):
+    """Tabela w zwijanej sekcji - liczona dopiero po rozwinięciu, potem tylko przy zmianie jej widżetów."""
+    with st.expander(title, key=f"{dimension}-expanded", on_change="rerun") as expander:
+        if expander.open:
+            render_table_page(data, dimension, fallback)
+
+
+def render_table_page(data, dimension, fallback):
+    """Tabela stronicowana i sortowana po stronie serwera - do przeglądarki idzie tylko widoczna strona."""
+    has_dimension = dimension in data["time_series"].dimensions
+    frame = entity_table(data, dimension) if has_dimension else data[fallback]
+    sortable = [column for column in SORT_COLUMNS if column in frame.columns]
+    filters = active_filters()
+    patterns = dict(filters[1]) if filters else {}
+    mask = None
+    if dimension in patterns and not has_dimension:
+        mask = data["search"][dimension].match(frame[dimension], patterns[dimension], filters[0])
+
+    sort_col, order_col, size_col, page_col = st.columns(4)
+    sort_by = sort_col.selectbox("Sortuj według", sortable, format_func=SORT_COLUMNS.get, key=f"{dimension}-sort")
+    descending = order_col.selectbox("Kolejność", [True, False], key=f"{dimension}-order",
+                                     format_func=lambda value: "Malejąco" if value else "Rosnąco")
+    page_size = size_col.selectbox("Wierszy na stronę", PAGE_SIZES, key=f"{dimension}-size")
+    pages = max(1, math.ceil((len(frame) if mask is None else int(mask.sum())) / page_size))
+    page_key = f"{dimension}-page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = page_col.number_input("Strona", min_value=1, max_value=pages, step=1, key=page_key)
+
+    with stage("page_rows", rows=len(frame)):
+        rows, total = page_rows(frame, sort_by, descending, page - 1, page_size, mask)
+    visible = [dimension, *TABLE_COLUMNS, *(column for column in DELTA_COLUMNS if column in frame.columns)]
+    with stage("table_payload", rows=len(rows)):
+        st.dataframe(rows[[column for column in visible if column in rows.columns]], hide_index=True,
+                     width="stretch", column_config={dimension: MOVER_DIMENSIONS[dimension], **TABLE_COLUMNS,
+                                                     **DELTA_COLUMNS})
+    first = (page - 1) * page_size
+    st.caption(f"Wiersze {min(total, first + 1)}–{first + len(rows)} z {format_int(total)}")
+
+
+@section
+def render_export(data):
+    """Wiersze bieżącego zakresu i filtrów do pliku; plik powstaje dopiero po kliknięciu.
+
+    Pobierany plik jest w całości w pamięci serwera, więc większe wyniki tylko przez ``python -m gsc.export``.
+    """
+    from gsc.export import FORMATS, MAX_DOWNLOAD_ROWS, command, export_bytes, file_name
+
+    start, end = st.session_state.date_start, st.session_state.date_end
+    store = filtered_store(data).slice(start, end)
+    fmt = st.radio("Format", list(EXPORT_FORMATS), key="export_format", format_func=EXPORT_FORMATS.get,
+                   horizontal=True)
+    st.caption(f"Wiersze: {format_int(len(store))} · {start:%d.%m.%Y} - {end:%d.%m.%Y}")
+    too_large = len(store) > MAX_DOWNLOAD_ROWS
+    if too_large:
+        st.caption(f"Ponad {format_int(MAX_DOWNLOAD_ROWS)} wierszy - taki plik zapisz na dysk poleceniem:")
+        st.code(command(data["site"], start, end, fmt, active_filters(), mock=not gsc_config()), language="bash")
+    # wywoływane w osobnym wątku po kliknięciu - bez dostępu do stanu sesji, stąd wszystko w argumentach
+    st.download_button("Pobierz", data=partial(export_bytes, store, fmt),
+                       file_name=file_name(data["site"], start, end, fmt), mime=FORMATS[fmt][1],
+                       on_click="ignore", disabled=not len(store) or too_large, width="stretch")
+
+
+def render_cache_stats():
+    stats = get_result_cache().stats()
+    with st.sidebar.expander("Pamięć podręczna"):
+        hits_col, misses_col = st.columns(2)
+        hits_col.metric("Trafienia", stats.hits)
+        misses_col.metric("Chybienia", stats.misses)
+        st.caption(f"Wpisy: {stats.entries} · {stats.bytes / 2**20:.1f} MB · usunięte (LRU): {stats.evictions}")
+
+
+def render_memory_report(data):
+    """Pamięć zajmowana przez dane bieżącej witryny - do wymiarowania serwera."""
+    report = cached(data, "memory", lambda: memory_report(data))
+    with st.sidebar.expander("Pamięć danych"):
+        st.caption(f"Razem: {report['bytes'].sum() / 2**20:.1f} MB · wiersze: {format_int(len(data['time_series']))}")
+        st.dataframe(report.assign(MB=report["bytes"] / 2**20).drop(columns="bytes"), hide_index=True,
+                     column_config={"component": "Składnik", "MB": st.column_config.NumberColumn(format="%.2f")})
+
+
+def render_perf_panel(current):
+    """Etapy bieżącego przebiegu i percentyle procesu (włączane w panelu bocznym)."""
+    with st.expander("Wydajność przebiegu", expanded=True):
+        st.caption(f"Przebieg: {current.seconds * 1000:.0f} ms")
+        stages = current.frame()
+        stages["stage"] = ["\u2003" * depth + path.rsplit(" / ", 1)[-1]
+                           for depth, path in zip(stages["depth"], stages["stage"])]
+        st.dataframe(stages.assign(ms=stages["seconds"] * 1000, MB=stages["peak_bytes"] / 2**20)
+                     .drop(columns=["depth", "seconds", "peak_bytes"]), hide_index=True, width="stretch",
+                     column_config={"stage": "Etap", "calls": "Wywołania", "rows": "Wiersze",
+                                    "ms": st.column_config.NumberColumn("ms", format="%.1f"),
+                                    "MB": st.column_config.NumberColumn("Szczyt MB", format="%.2f")})
+        st.caption("Wszystkie sesje procesu (sekundy)")
+        st.dataframe(get_perf_log().summary(), hide_index=True, width="stretch")
+
+
+def render_login():
+    st.title("Google Search Console")
+    st.write("Połącz się z GSC, aby zobaczyć swoje dane analityczne")
+    st.button("Połącz z Google", on_click=handle_auth, type="primary", width="stretch")
+    st.caption("Ta aplikacja używa OAuth 2.0 do bezpiecznego połączenia z GSC")
+
+
+def load_portfolio(sites, start, end):
+    from gsc.report import DEFAULT_ROOT as REPORTS_ROOT, data_version, read_report
+
+    fetcher = get_fetcher()
+    if fetcher:
+        warehouse = get_warehouse()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            version = tuple(pool.map(lambda site: sync_site(fetcher, warehouse, site), sites))
+        root = str(warehouse.root)
+    else:
+        root, version = None, "mock"
+
+    def compute():
+        # gotowe raporty z ``python -m gsc.report`` (tej samej wersji danych), reszta liczona na miejscu
+        reports = {site: read_report(REPORTS_ROOT, site, start, end, data_version(site, root)) for site in sites}
+        missing = [site for site, report in reports.items() if report is None]
+        computed = dict(zip(missing, summarize_portfolio(missing, start, end, warehouse_root=root)))
+        return [reports[site] or computed[site] for site in sites]
+
+    key = cache_key("*portfolio*", version, "portfolio", sites=tuple(sites), start=start, end=end)
+    return get_result_cache().get_or_compute(key, compute, ttl_for(end, today()))
+
+
+def render_portfolio():
+    st.title("Portfel witryn")
+    st.button("Wróć do listy witryn", on_click=set_portfolio, args=(False,))
+    render_period_controls()
+
+    start, end = st.session_state.date_start, st.session_state.date_end
+    with st.spinner("Ładowanie danych wszystkich witryn..."):
+        summaries = load_portfolio(list(st.session_state.sites), start, end)
+
+    st.dataframe(portfolio_table(summaries), hide_index=True, width="stretch", column_config={
+        "site": "Witryna",
+        **TABLE_COLUMNS,
+        "clicks_change": st.column_config.NumberColumn("Zmiana kliknięć", format="%+.1f%%"),
+        "impressions_change": st.column_config.NumberColumn("Zmiana wyświetleń", format="%+.1f%%"),
+        "ctr_change": st.column_config.NumberColumn("Zmiana CTR", format="%+.1f%%"),
+        "position_change": st.column_config.NumberColumn("Zmiana pozycji", format="%+.1f%%"),
+        "trend": st.column_config.LineChartColumn("Kliknięcia (miesięcznie)"),
+    })
+
+    site_column = {"site": "Witryna"}
+    for key, title, dimension in (("top_pages", "Najpopularniejsze strony", "page"),
+                                  ("top_queries", "Najpopularniejsze zapytania", "query")):
+        st.subheader(f"{title} — wszystkie witryny")
+        st.dataframe(cross_site_top(summaries, key), hide_index=True, width="stretch",
+                     column_config={**site_column, dimension: MOVER_DIMENSIONS[dimension], **TABLE_COLUMNS})
+
+        winners = cross_site_top(summaries, f"{dimension}_winners", "clicks_delta")
+        losers = cross_site_top(summaries, f"{dimension}_losers", "clicks_delta")
+        if len(winners) or len(losers):
+            winners_col, losers_col = st.columns(2)
+            for column, label, frame in ((winners_col, "Wzrosty", winners), (losers_col, "Spadki", losers)):
+                column.caption(f"{label} — {MOVER_DIMENSIONS[dimension].lower()}")
+                column.dataframe(frame[["site", dimension, "clicks", "clicks_delta"]], hide_index=True,
+                                 width="stretch", column_config={
+                                     **site_column, dimension: MOVER_DIMENSIONS[dimension],
+                                     "clicks": TABLE_COLUMNS["clicks"], "clicks_delta": DELTA_COLUMNS["clicks_delta"],
+                                 })
+
+
+def render_site_picker():
+    st.title("Wybierz witrynę")
+    st.button("Widok portfela (wszystkie witryny)", on_click=set_portfolio, args=(True,), type="primary")
+    prefetcher, loaded = get_prefetcher(), get_registry().versions()
+    for site in st.session_state.sites:
+        with st.container(border=True):
+            st.subheader(site)
+            if site in loaded:
+                st.caption("Dane gotowe")
+            elif prefetcher.status(site) in ("queued", "running"):
+                st.caption("Wczytywanie w tle...")
+            st.button("Kliknij, aby zobaczyć dane", key=f"site-{site}",
+                      on_click=handle_site_select, args=(site,))
+
+
+def render_period_controls(data=None):
+    # Wybór okresu
+    for column, (period, (label, _, _)) in zip(st.columns(len(PERIODS)), PERIODS.items()):
+        column.button(label, on_click=set_period, args=(period,), width="stretch",
+                      type="primary" if st.session_state.selected_period == period else "secondary")
+
+    # Własny zakres
+    columns = st.columns(2 if data is None else 3)
+    columns[0].date_input("Własny zakres: od", key="date_start", on_change=set_custom_period)
+    columns[1].date_input("do", key="date_end", on_change=set_custom_period)
+    if data is not None:
+        columns[2].selectbox("Porównanie", list(COMPARISONS), key="comparison", format_func=COMPARISONS.get)
+
+        # Filtry stron i zapytań (indeks trigramowy) oraz krajów i urządzeń (kostka)
+        page_col, query_col, mode_col = st.columns([2, 2, 1])
+        page_col.text_input("Filtr stron", key="page_filter", placeholder="np. /blog/")
+        query_col.text_input("Filtr zapytań", key="query_filter", placeholder="np. seo")
+        mode_col.selectbox("Dopasowanie", list(FILTER_MODES), key="filter_mode", format_func=FILTER_MODES.get)
+        cube = data["cube"]
+        dimensions = [dimension for dimension in VALUE_FILTERS if dimension in cube.dimensions]
+        for column, dimension in zip(st.columns(len(dimensions)) if dimensions else (), dimensions):
+            column.multiselect(VALUE_FILTERS[dimension], sorted(map(str, cube.labels(dimension))),
+                               key=f"{dimension}_filter")
+        if st.session_state.filter_mode == "regex":
+            for dimension in MOVER_DIMENSIONS:
+                error = regex_error(st.session_state.get(f"{dimension}_filter", ""))
+                if error:
+                    st.warning(f"Niepoprawne wyrażenie ({MOVER_DIMENSIONS[dimension].lower()}): {error}")
+
+
+@section
+def render_summary(data):
+    start, end = st.session_state.date_start, st.session_state.date_end
+    period = cached(data, "totals", lambda: compare_totals(filtered_totals(data), start, end),
+                    start=start, end=end, filters=active_filters())
+    current = period["current"]
+    change = period[f"change_{st.session_state.comparison}"]
+
+    cards = st.columns(4)
+    stat_card(cards[0], "Kliknięcia w okresie", format_int(current["clicks"]), change["clicks"])
+    stat_card(cards[1], "Wyświetlenia w okresie", format_int(current["impressions"]), change["impressions"])
+    stat_card(cards[2], "Średnie CTR", f"{current['ctr']:.2f}%", change["ctr"])
+    stat_card(cards[3], "Średnia pozycja", f"{current['position']:.1f}", change["position"], inverse=True)
+
+
+@section
+def render_charts(data):
+    """Wykresy czasowe; agregacja i przybliżenie są widżetami tej sekcji, więc przeliczają tylko ją."""
+    aggregation_col, zoom_col = st.columns([1, 3], vertical_alignment="bottom")
+    aggregation_col.selectbox("Agregacja", list(AGGREGATIONS), key="aggregation", format_func=AGGREGATIONS.get)
+    label = AGGREGATIONS[st.session_state.aggregation].lower()
+
+    zoom = st.session_state.chart_zoom
+    if zoom:
+        label = f"dziennie, {zoom[0]:%d.%m.%Y} - {zoom[1]:%d.%m.%Y}"
+        zoom_col.button("Pokaż cały zakres", on_click=reset_chart_zoom)
+    else:
+        zoom_col.caption("Zaznacz fragment wykresu, aby zobaczyć go dziennie.")
+
+    st.subheader(f"Ruch w czasie ({label})")
+    render_time_chart(data, "traffic_chart", ("clicks", "Kliknięcia", COLORS[0]),
+                      ("impressions", "Wyświetlenia", COLORS[1]))
+
+    st.subheader(f"CTR i Pozycja w czasie ({label})")
+    render_time_chart(data, "quality_chart", ("ctr", "CTR (%)", COLORS[2]),
+                      ("position", "Pozycja", COLORS[3]), reverse_right=True)
+
+
+@section
+def render_breakdowns(data):
+    import plotly.graph_objects as go
+
+    country_col, device_col = st.columns(2)
+    with country_col:
+        st.subheader("Ruch według krajów")
+        country_data = breakdown(data, "country", "country_data")
+        top_clicks = country_data["clicks"].iloc[0] if len(country_data) else 0
+        for row in country_data.itertuples():
+            # bez kliknięć w zakresie (same wyświetlenia) wszystkie paski są puste
+            st.progress(float(row.clicks / top_clicks) if top_clicks else 0.0,
+                        text=f"{row.country} — {format_int(row.clicks)} kliknięć")
+
+    with device_col:
+        st.subheader("Ruch według urządzeń")
+        device_data = breakdown(data, "device", "device_data")
+        figure = go.Figure(go.Pie(labels=device_data["device"], values=device_data["clicks"],
+                                  marker=dict(colors=COLORS), textinfo="label+percent"))
+        figure.update_layout(height=250, margin=dict(l=0, r=0, t=10, b=0), showlegend=False)
+        st.plotly_chart(figure, width="stretch")
+
+
+def render_dashboard(data):
+    st.title("Dashboard GSC")
+    st.write(st.session_state.selected_site)
+    render_period_controls(data)
+
+    render_summary(data)
+    render_charts(data)
+    render_breakdowns(data)
+    render_movers(data)
+    render_alerts(data)
+
+    # Poniżej pierwszego ekranu: liczone dopiero po rozwinięciu
+    render_top_table(data, "page", "Najpopularniejsze strony", "top_pages")
+    render_top_table(data, "query", "Najpopularniejsze zapytania", "top_queries")
+
+
+def render_app():
+    if not st.session_state.is_authenticated:
+        render_login()
+        return
+
+    if st.session_state.portfolio:
+        render_portfolio()
+        render_cache_stats()
+        return
+
+    if not st.session_state.selected_site:
+        render_site_picker()
+        return
+
+    data = st.session_state.data
+    if data is not None and get_registry().versions().get(data["site"], data["version"]) != data["version"]:
+        # inna sesja zsynchronizowała nowszą wersję - przejście na nią zwalnia starą kopię
+        st.session_state.data = None
+    if st.session_state.data is None:
+        with st.spinner("Ładowanie danych..."), stage("load"):
+            st.session_state.data = load_site_data(st.session_state.selected_site)
+
+    render_dashboard(st.session_state.data)
+    with st.sidebar.expander("Eksport danych"):
+        render_export(st.session_state.data)
+    render_cache_stats()
+    render_memory_report(st.session_state.data)
+
+
+def main():
+    st.set_page_config(page_title="Dashboard GSC", layout="wide")
+    init_state()
+    st.sidebar.toggle("Panel wydajności", key="perf_debug")
+
+    with trace(memory=st.session_state.perf_debug) as current:
+        render_app()
+    get_perf_log().record(current)
+    if st.session_state.perf_debug:
+        render_perf_panel(current)
+
+
+# procesy puli portfela (spawn/forkserver) importują skrypt jako __mp_main__ - bez rysowania strony
+if __name__ == "__main__":
+    main()
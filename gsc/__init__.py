@@ -0,0 +1,5 @@
+"""Warstwa danych dashboardu Google Search Console.
+
+Moduły importuje się bezpośrednio (``from gsc.store import TimeSeriesStore``): pakiet niczego
+nie ładuje z góry, więc ekran logowania nie płaci za pyarrow.parquet hurtowni i eksportu.
+"""
@@ -0,0 +1,119 @@
+"""Wykrywanie nagłych spadków kliknięć i pozycji dla wszystkich stron/zapytań naraz.
+
+Wiersze okna są sumowane do macierzy encja × dzień jednym ``bincount``.
+Linia bazowa to ``baseline`` dni tuż przed ostatnimi ``recent`` dniami
+(przesuwa się razem z końcem zakresu): jej średnia i odchylenie dzienne
+dają z-score średniej z ostatnich dni. Trend to nachylenie prostej MNK
+przez całe okno (iloczyn macierzy z wektorem czasu). Wszystko to operacje
+na osiach macierzy - bez pętli po encjach.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from gsc.store import TimeSeriesStore, factorize, to_day, weighted
+from gsc.topk import top_k
+
+RECENT_DAYS = 7
+BASELINE_DAYS = 28
+# Próg z-score dla spadku kliknięć
+Z_THRESHOLD = 3.0
+# Spadek o tyle pozycji (średnia ważona wyświetleniami) jest alertem
+POSITION_THRESHOLD = 3.0
+# Spadek trendu o taką część średniej bazowej w całym oknie
+TREND_THRESHOLD = 0.5
+# Encje z mniejszym ruchem w linii bazowej są pomijane (szum)
+MIN_DAILY_CLICKS = 1.0
+MIN_DAILY_IMPRESSIONS = 10.0
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+def entity_day_matrix(store: TimeSeriesStore, dimension: str, start, end) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Etykiety i macierze encja × dzień (kliknięcia, wyświetlenia, pozycja × wyświetlenia) dla [od, do]."""
+    start, end = to_day(start), to_day(end)
+    days = int((end - start) // _ONE_DAY) + 1
+    window = store.slice(start, end)
+    codes, labels = factorize(window.columns[dimension])
+    key = codes.astype(np.int64) * days + (window.date - start).astype(np.int64)
+    size = len(labels) * days
+
+    def matrix(values):
+        return np.bincount(key, weights=values, minlength=size).reshape(len(labels), days)
+
+    impressions = window.impressions
+    return labels, {
+        "clicks": matrix(window.clicks),
+        "impressions": matrix(impressions),
+        "position": matrix(window.position * impressions),
+    }
+
+
+def zscores(values: np.ndarray, baseline: int) -> np.ndarray:
+    """Z-score średniej z kolumn po ``baseline`` pierwszych względem rozkładu dziennego linii bazowej.
+
+    Odchylenie ma dolną granicę jak w rozkładzie Poissona (pierwiastek ze
+    średniej, co najmniej 1), więc rzadkie encje nie dają ogromnych wartości.
+    """
+    base, recent = values[:, :baseline], values[:, baseline:]
+    mean = base.mean(axis=1)
+    sigma = np.maximum(np.sqrt(np.maximum(base.var(axis=1), mean)), 1.0)
+    return (recent.mean(axis=1) - mean) / (sigma / np.sqrt(recent.shape[1]))
+
+
+def slopes(values: np.ndarray) -> np.ndarray:
+    """Nachylenie prostej MNK przez kolumny (zmiana na dzień) dla każdego wiersza."""
+    t = np.arange(values.shape[1], dtype=np.float64)
+    t -= t.mean()
+    return values @ t / (t @ t)
+
+
+def detect_anomalies(store: TimeSeriesStore, dimension: str, end, recent: int = RECENT_DAYS,
+                     baseline: int = BASELINE_DAYS, z_threshold: float = Z_THRESHOLD,
+                     position_threshold: float = POSITION_THRESHOLD, trend_threshold: float = TREND_THRESHOLD,
+                     n: int = 100) -> pd.DataFrame:
+    """Encje ze spadkiem kliknięć, pozycji albo trendu w ``recent`` dniach do ``end``, od największej straty.
+
+    ``lost_clicks`` to różnica między linią bazową a faktycznymi kliknięciami
+    w ostatnich dniach; kolumny ``clicks_drop``, ``position_drop`` i
+    ``declining`` mówią, który warunek zadziałał.
+    """
+    end = to_day(end)
+    start = end - (recent + baseline - 1) * _ONE_DAY
+    labels, sums = entity_day_matrix(store, dimension, start, end)
+    clicks, impressions = sums["clicks"], sums["impressions"]
+
+    base_clicks = clicks[:, :baseline].mean(axis=1)
+    recent_clicks = clicks[:, baseline:].mean(axis=1)
+    zscore = zscores(clicks, baseline)
+    trend = weighted(slopes(clicks) * clicks.shape[1], base_clicks)
+
+    base_impressions = impressions[:, :baseline].sum(axis=1)
+    recent_impressions = impressions[:, baseline:].sum(axis=1)
+    base_position = weighted(sums["position"][:, :baseline].sum(axis=1), base_impressions)
+    recent_position = weighted(sums["position"][:, baseline:].sum(axis=1), recent_impressions)
+
+    active = base_clicks >= MIN_DAILY_CLICKS
+    visible = base_impressions / baseline >= MIN_DAILY_IMPRESSIONS
+    with np.errstate(invalid="ignore"):
+        clicks_drop = active & (zscore <= -z_threshold)
+        position_drop = visible & (recent_position - base_position >= position_threshold)
+        declining = active & (trend <= -trend_threshold)
+
+    frame = pd.DataFrame({
+        dimension: labels,
+        "baseline_clicks": base_clicks,
+        "recent_clicks": recent_clicks,
+        "lost_clicks": (base_clicks - recent_clicks) * recent,
+        "zscore": zscore,
+        "trend": trend * 100.0,
+        "baseline_position": base_position,
+        "recent_position": recent_position,
+        "position_delta": recent_position - base_position,
+        "clicks_drop": clicks_drop,
+        "position_drop": position_drop,
+        "declining": declining,
+    })
+    return top_k(frame, "lost_clicks", n, descending=True, mask=clicks_drop | position_drop | declining)
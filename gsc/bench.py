@@ -0,0 +1,226 @@
+"""Benchmarki etapów potoku na syntetycznych danych w kilku skalach.
+
+Uruchomienie::
+
+    python -m gsc.bench --sizes 100000 1000000 --repeat 3 --compare
+
+Każdy etap (parsowanie odpowiedzi API, budowa indeksów, filtr, agregacja,
+top-K, porównanie okresów, alerty, dane wykresu) jest mierzony ``repeat`` razy;
+zapisywane jest minimum i mediana. Wyniki trafiają do pliku JSON Lines
+razem z wersją kodu, a ``--compare`` zestawia je z ostatnim pomiarem innej
+wersji i kończy się kodem 1, gdy któryś etap zwolnił ponad próg.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gsc.anomaly import BASELINE_DAYS, RECENT_DAYS, detect_anomalies
+from gsc.compare import compare_totals, entity_deltas, top_movers
+from gsc.cube import Cube
+from gsc.downsample import CHART_POINTS, downsample
+from gsc.fetch import ROW_LIMIT, TABLES
+from gsc.ingest import parse_response
+from gsc.search import SearchIndex
+from gsc.store import factorize
+from gsc.synthetic import END_DATE, api_rows, generate
+from gsc.topk import top_k
+from gsc.totals import PrefixSumIndex
+
+SIZES = (100_000, 1_000_000)
+RESULTS = Path(os.environ.get("GSC_BENCH_RESULTS", ".gsc_bench.jsonl"))
+# Spowolnienie uznawane za regresję (20%)
+THRESHOLD = 0.2
+# Bieżący zakres jak domyślny w dashboardzie: ostatni kwartał danych
+WINDOW = (END_DATE - 91, END_DATE)
+
+
+def setup(size: int, seed: int = 0) -> dict:
+    """Dane i struktury wspólne dla etapów (czas przygotowania nie jest mierzony)."""
+    store = generate(size, seed=seed)
+    page = {"rows": api_rows(store.take(np.arange(min(size, ROW_LIMIT))))}
+    # szereg punkt na wiersz - dłuższy niż budżet wykresu w każdej skali, więc LTTB zawsze pracuje
+    series = pd.DataFrame({"date": store.date, "clicks": store.clicks, "impressions": store.impressions})
+    context = {"store": store, "payload": json.dumps(page).encode(), "series": series}
+    context.update(build_indexes(context))
+    return context
+
+
+def build_indexes(context: dict) -> dict:
+    store = context["store"]
+    return {
+        "cube": Cube(store),
+        "search": {name: SearchIndex(factorize(store.columns[name])[1]) for name in ("page", "query")},
+        "totals": PrefixSumIndex(store),
+    }
+
+
+def fetch_parse(context: dict) -> int:
+    """Jedna strona odpowiedzi API (ROW_LIMIT wierszy): strumień JSON -> kolumny -> magazyn."""
+    return len(parse_response(io.BytesIO(context["payload"]), TABLES["cube"][0]))
+
+
+def index_build(context: dict) -> int:
+    build_indexes(context)
+    return len(context["store"])
+
+
+def filter_rows(context: dict) -> int:
+    """Filtr zapytań (indeks trigramowy) i kraju (kostka), potem kopia wybranych wierszy."""
+    cube = context["cube"]
+    masks = {
+        "query": context["search"]["query"].match(cube.labels("query"), "seo"),
+        "country": cube.indexes["country"].value_mask(["pol"]),
+    }
+    return len(context["store"].take(cube.mask(masks)))
+
+
+def rollup(context: dict) -> int:
+    store = context["store"]
+    for freq in ("day", "week", "month"):
+        store.rollup(freq)
+    return len(store)
+
+
+def top_pages(context: dict) -> int:
+    window = context["store"].slice(*WINDOW)
+    top_k(window.totals_by("page", sort=False), "clicks", 100)
+    return len(window)
+
+
+def comparison(context: dict) -> int:
+    store = context["store"]
+    compare_totals(context["totals"], *WINDOW)
+    top_movers(entity_deltas(store, "query", *WINDOW))
+    return len(store)
+
+
+def chart_payload(context: dict) -> int:
+    """Szereg o długości magazynu zmniejszony LTTB do ``CHART_POINTS`` i zserializowany jak dla przeglądarki.
+
+    Dzienny szereg całej historii ma mniej punktów niż budżet wykresu i przeszedłby bez LTTB.
+    """
+    series = context["series"]
+    frame = downsample(series, ("clicks", "impressions"), CHART_POINTS)
+    frame.to_json(orient="split", date_format="iso")
+    return len(series)
+
+
+def anomalies(context: dict) -> int:
+    """Alerty dla wszystkich zapytań (macierz zapytanie × dzień)."""
+    store = context["store"]
+    detect_anomalies(store, "query", WINDOW[1])
+    return len(store.slice(WINDOW[1] - (RECENT_DAYS + BASELINE_DAYS - 1), WINDOW[1]))
+
+
+STAGES: dict[str, Callable[[dict], int]] = {
+    "fetch_parse": fetch_parse,
+    "index_build": index_build,
+    "filter": filter_rows,
+    "rollup": rollup,
+    "top_k": top_pages,
+    "comparison": comparison,
+    "anomalies": anomalies,
+    "chart_payload": chart_payload,
+}
+
+
+def code_version() -> str:
+    """``GSC_BENCH_VERSION`` albo ``git describe`` katalogu pakietu."""
+    if "GSC_BENCH_VERSION" in os.environ:
+        return os.environ["GSC_BENCH_VERSION"]
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(sizes: Sequence[int] = SIZES, stages: Sequence[str] = tuple(STAGES), repeat: int = 3,
+        seed: int = 0) -> pd.DataFrame:
+    """Czasy etapów: wiersz na (rozmiar, etap)."""
+    version, now = code_version(), datetime.now(timezone.utc).isoformat(timespec="seconds")
+    records = []
+    for size in sizes:
+        context = setup(size, seed)
+        for stage in stages:
+            times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                units = STAGES[stage](context)
+                times.append(time.perf_counter() - started)
+            records.append({
+                "version": version, "timestamp": now, "size": size, "stage": stage,
+                "seconds": min(times), "median": float(np.median(times)), "units": units,
+                "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            })
+    return pd.DataFrame.from_records(records)
+
+
+def save(results: pd.DataFrame, path: str | Path = RESULTS) -> None:
+    with open(path, "a", encoding="utf-8") as file:
+        for record in results.to_dict("records"):
+            file.write(json.dumps(record) + "\n")
+
+
+def load(path: str | Path = RESULTS) -> pd.DataFrame:
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame(columns=["version", "timestamp", "size", "stage", "seconds"])
+    return pd.read_json(path, lines=True, dtype={"version": str})
+
+
+def compare(results: pd.DataFrame, history: pd.DataFrame, threshold: float = THRESHOLD) -> pd.DataFrame:
+    """Zestawienie z ostatnim pomiarem innej wersji dla tego samego rozmiaru i etapu."""
+    version = results["version"].iloc[0] if len(results) else None
+    previous = history[history["version"] != version].sort_values("timestamp", kind="stable")
+    previous = previous.groupby(["size", "stage"], as_index=False).last()[["size", "stage", "version", "seconds"]]
+    frame = results[["size", "stage", "seconds"]].merge(previous, on=["size", "stage"], how="left",
+                                                         suffixes=("", "_previous"))
+    frame = frame.rename(columns={"version": "previous_version"})
+    frame["ratio"] = frame["seconds"] / frame["seconds_previous"]
+    frame["regression"] = frame["ratio"] > 1.0 + threshold
+    return frame
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m gsc.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results", type=Path, default=RESULTS, help="plik JSON Lines z historią pomiarów")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="porównaj z poprzednią wersją")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    history = load(args.results)
+    results = run(args.sizes, args.stages, args.repeat, args.seed)
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(results[["size", "stage", "seconds", "median", "units"]].to_string(index=False))
+        if not args.no_save:
+            save(results, args.results)
+        if args.compare:
+            report = compare(results, history, args.threshold)
+            print()
+            print(report.to_string(index=False))
+            return 1 if report["regression"].any() else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
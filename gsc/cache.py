@@ -0,0 +1,147 @@
+"""Pamięć podręczna wyników z limitem pamięci (LRU) i czasem życia (TTL).
+
+Jedna instancja na proces (w aplikacji trzymana przez ``st.cache_resource``),
+współdzielona przez sesje - zwracanych wartości nie wolno modyfikować.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from gsc.fetch import FRESH_DAYS
+from gsc.store import nbytes, to_day
+
+DEFAULT_MAX_BYTES = int(os.environ.get("GSC_CACHE_MB", "512")) * 2**20
+# Wyniki obejmujące niefinalne dni żyją krótko, reszta do następnej synchronizacji
+FRESH_TTL = 5 * 60
+FINAL_TTL = 24 * 60 * 60
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires: float
+
+
+def cache_key(site: str, version: Hashable, kind: str, **params) -> tuple:
+    """Klucz: witryna, wersja danych, rodzaj wyniku i posortowane parametry (zakres, agregacja, filtry)."""
+    return (site, version, kind, *sorted((name, _hashable(value)) for name, value in params.items()))
+
+
+def ttl_for(end, today=None) -> float:
+    """TTL zależny od świeżości: krótki, gdy zakres sięga niefinalnych dni."""
+    today = to_day(today if today is not None else np.datetime64("today"))
+    return FRESH_TTL if to_day(end) > today - np.timedelta64(FRESH_DAYS, "D") else FINAL_TTL
+
+
+def sizeof(value) -> int:
+    """Przybliżony rozmiar wyniku w bajtach."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, pd.Categorical):
+        return nbytes(value)
+    if hasattr(value, "nbytes"):
+        # tablice NumPy, TimeSeriesStore, indeksy (PrefixSumIndex, Cube, SearchIndex)
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+def memory_report(data: Mapping) -> pd.DataFrame:
+    """Rozmiar składników zbioru danych witryny (kolumny szeregu osobno), malejąco."""
+    store = data["time_series"]
+    rows = [(f"time_series.{name}", size) for name, size in store.memory_usage().items()]
+    # tabele usługi; bez nich w ``aggregates`` stoi sam ``time_series`` - już policzony
+    rows += [(f"aggregates.{name}", sizeof(value)) for name, value in data.get("aggregates", {}).items()
+             if value is not store]
+    rows += [(name, sizeof(value)) for name, value in data.items()
+             if name not in ("time_series", "aggregates") and not isinstance(value, (str, int))]
+    frame = pd.DataFrame(rows, columns=["component", "bytes"])
+    return frame.sort_values("bytes", ascending=False, ignore_index=True)
+
+
+class ResultCache:
+    """LRU z budżetem bajtów i TTL per wpis; bezpieczne wątkowo."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], Any], ttl: float = FINAL_TTL) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > self.clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.value
+            if entry is not None:
+                self._remove(key)
+            self._misses += 1
+        value = compute()
+        self.put(key, value, ttl)
+        return value
+
+    def put(self, key: tuple, value: Any, ttl: float = FINAL_TTL) -> None:
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, self.clock() + ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, site: str | None = None, keep_version: Hashable | None = None) -> int:
+        """Usuwa wpisy witryny (albo wszystkie); z ``keep_version`` - tylko wpisy innych wersji danych.
+
+        Zwraca liczbę usuniętych.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if (site is None or key[0] == site)
+                    and (keep_version is None or key[1] != keep_version)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._bytes)
+
+    def _remove(self, key: tuple) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+
+def _hashable(value):
+    if isinstance(value, (list, set, frozenset)):
+        return tuple(sorted(map(_hashable, value)))
+    if isinstance(value, dict):
+        return tuple(sorted((name, _hashable(item)) for name, item in value.items()))
+    return value
@@ -0,0 +1,100 @@
+"""Porównania okres do okresu: poprzedni okres tej samej długości i rok wcześniej."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from gsc.store import TimeSeriesStore, factorize, to_day, weighted
+from gsc.topk import top_k
+from gsc.totals import PrefixSumIndex
+
+COMPARISONS = ("previous", "year_ago")
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+class Windows(NamedTuple):
+    current: tuple[np.datetime64, np.datetime64]
+    previous: tuple[np.datetime64, np.datetime64]
+    year_ago: tuple[np.datetime64, np.datetime64]
+
+
+def comparison_windows(start, end) -> Windows:
+    """Bieżące okno oraz okna porównawcze (poprzednie o tej samej długości, rok wcześniej)."""
+    start, end = to_day(start), to_day(end)
+    length = end - start + _ONE_DAY
+    year = relativedelta(years=1)
+    return Windows(
+        current=(start, end),
+        previous=(start - length, start - _ONE_DAY),
+        year_ago=(to_day(start.item() - year), to_day(end.item() - year)),
+    )
+
+
+def percent_change(current, previous):
+    """Zmiana procentowa; NaN, gdy brak wartości bazowej."""
+    current = np.asarray(current, dtype=np.float64)
+    previous = np.asarray(previous, dtype=np.float64)
+    return weighted((current - previous) * 100.0, previous)
+
+
+def compare_totals(index: PrefixSumIndex, start, end) -> pd.DataFrame:
+    """Metryki okresu i ich zmiany względem obu okien porównawczych (po jednym wierszu na metrykę)."""
+    windows = comparison_windows(start, end)
+    frame = pd.DataFrame({
+        name: pd.Series(index.totals(*window)._asdict(), dtype=np.float64)
+        for name, window in windows._asdict().items()
+    })
+    for name in COMPARISONS:
+        frame[f"change_{name}"] = percent_change(frame["current"], frame[name])
+    return frame
+
+
+def entity_deltas(store: TimeSeriesStore, dimension: str, start, end,
+                  against: str = "previous") -> pd.DataFrame:
+    """Metryki per wartość wymiaru w bieżącym oknie i w oknie porównawczym.
+
+    Wiersze obu okien są sklejane i kodowane jako ``kod * 2 + okno``, więc
+    każda suma to jeden ``bincount`` po całym zbiorze, bez pętli po encjach.
+    """
+    if against not in COMPARISONS:
+        raise ValueError(f"Nieznane porównanie: {against!r}")
+    windows = comparison_windows(start, end)
+    old_lo, old_hi = store.bounds(*getattr(windows, against))
+    cur_lo, cur_hi = store.bounds(*windows.current)
+    rows = np.r_[old_lo:old_hi, cur_lo:cur_hi]
+    side = np.r_[np.zeros(old_hi - old_lo, np.intp), np.ones(cur_hi - cur_lo, np.intp)]
+
+    codes, labels = factorize(store.columns[dimension][rows])
+    key = codes.astype(np.intp) * 2 + side
+    size = 2 * len(labels)
+
+    def sums(values):
+        return np.bincount(key, weights=values, minlength=size).reshape(-1, 2)
+
+    clicks = sums(store.clicks[rows])
+    impressions = sums(store.impressions[rows])
+    position = weighted(sums(store.position[rows] * store.impressions[rows]), impressions)
+
+    frame = pd.DataFrame({dimension: labels})
+    for metric, values in (("clicks", clicks), ("impressions", impressions), ("position", position)):
+        frame[f"{metric}_before"] = values[:, 0]
+        frame[metric] = values[:, 1]
+        frame[f"{metric}_delta"] = values[:, 1] - values[:, 0]
+    ctr = weighted(clicks * 100.0, impressions)
+    frame["ctr_before"] = ctr[:, 0]
+    frame["ctr"] = ctr[:, 1]
+    frame["ctr_delta"] = ctr[:, 1] - ctr[:, 0]
+    frame["clicks_change"] = percent_change(frame["clicks"], frame["clicks_before"])
+    return frame
+
+
+def top_movers(deltas: pd.DataFrame, metric: str = "clicks_delta", n: int = 10) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Największe wzrosty i spadki według wybranej kolumny zmian."""
+    values = deltas[metric].to_numpy()
+    return (top_k(deltas, metric, n, descending=True, mask=values > 0),
+            top_k(deltas, metric, n, descending=False, mask=values < 0))
@@ -0,0 +1,135 @@
+"""Kostka wymiarów GSC (strona × zapytanie × kraj × urządzenie × data) z indeksami wierszy.
+
+Wiersze to komórki, które GSC zwraca już zagregowane (dzień × kombinacja
+wymiarów). Dla każdego wymiaru budowany jest indeks odwrócony: wiersze
+pogrupowane po wartości (CSR), ale tylko dla wartości rzadkich. Wybór
+obejmujący dużo wierszy (np. wartość gęsta) to jedno odwzorowanie kodów
+wierszy przez maskę etykiet - kody kolumny słownikowej są brane z magazynu
+bez kopiowania. Dowolna kombinacja filtrów to suma list w obrębie wymiaru i
+przecięcie między wymiarami, a potem sumowanie kolumn tylko dla wybranych
+wierszy.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from gsc.store import TimeSeriesStore, factorize, weighted
+from gsc.totals import PeriodTotals
+
+CUBE_DIMENSIONS = ("page", "query", "country", "device")
+# Wartość jest "gęsta" (bez listy wierszy), gdy ma więcej niż n/32 wierszy
+DENSE_FRACTION = 1 / 32
+
+
+class DimensionIndex:
+    """Indeks odwrócony jednego wymiaru: kody wierszy i listy wierszy wartości rzadkich."""
+
+    def __init__(self, values: np.ndarray):
+        # kody kolumny słownikowej w jej wąskim typie - współdzielone z magazynem, jeśli się da
+        self.codes, self.labels = factorize(values)
+        self._shared = isinstance(values, pd.Categorical) and np.shares_memory(self.codes, values.codes)
+        counts = np.bincount(self.codes, minlength=len(self.labels))
+        self.dense = counts > len(self.codes) * DENSE_FRACTION
+        sparse = np.flatnonzero(~self.dense[self.codes])
+        self.order = sparse[np.argsort(self.codes[sparse], kind="stable")].astype(_row_dtype(len(self.codes)))
+        self.offsets = np.r_[0, np.cumsum(np.where(self.dense, 0, counts))]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def nbytes(self) -> int:
+        """Rozmiar indeksu bez kodów współdzielonych z magazynem."""
+        return (0 if self._shared else self.codes.nbytes) + self.order.nbytes + self.offsets.nbytes + self.dense.nbytes
+
+    def value_mask(self, values) -> np.ndarray:
+        """Maska nad etykietami dla listy wartości."""
+        return np.isin(self.labels, np.asarray(list(values), dtype=object))
+
+    def rows(self, label_mask: np.ndarray, size: int) -> np.ndarray:
+        """Maska wierszy dla wybranych wartości (suma list wierszy)."""
+        selected = np.flatnonzero(label_mask)
+        counts = self.offsets[selected + 1] - self.offsets[selected]
+        if self.dense[selected].any() or counts.sum() > size * DENSE_FRACTION:
+            # dużo wierszy - jedno wektorowe odwzorowanie kodów jest tańsze niż sklejanie list
+            return label_mask[self.codes]
+        mask = np.zeros(size, dtype=bool)
+        for code, count in zip(selected, counts):
+            if count:
+                mask[self.order[self.offsets[code]:self.offsets[code + 1]]] = True
+        return mask
+
+
+class Cube:
+    """Wielowymiarowa kostka nad ``TimeSeriesStore`` (bez kopiowania kolumn metryk)."""
+
+    def __init__(self, store: TimeSeriesStore, dimensions=CUBE_DIMENSIONS):
+        self.store = store
+        self.dimensions = tuple(name for name in dimensions if name in store.dimensions)
+        self.indexes = {name: DimensionIndex(store.columns[name]) for name in self.dimensions}
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @property
+    def nbytes(self) -> int:
+        """Rozmiar indeksów (kolumny metryk należą do ``store``)."""
+        return sum(index.nbytes for index in self.indexes.values())
+
+    def labels(self, dimension: str) -> np.ndarray:
+        return self.indexes[dimension].labels
+
+    def mask(self, filters: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Maska wierszy dla filtrów ``wymiar -> maska nad etykietami`` (iloczyn między wymiarami)."""
+        mask = np.ones(len(self), dtype=bool)
+        for dimension, label_mask in filters.items():
+            mask &= self.indexes[dimension].rows(label_mask, len(self))
+        return mask
+
+    def rows(self, filters: Mapping[str, np.ndarray], start=None, end=None) -> np.ndarray:
+        """Numery wybranych wierszy (rosnąco, więc w kolejności dat)."""
+        lo, hi = self._bounds(start, end)
+        if not filters:
+            return np.arange(lo, hi)
+        return lo + np.flatnonzero(self.mask(filters)[lo:hi])
+
+    def totals(self, filters: Mapping[str, np.ndarray], start=None, end=None) -> PeriodTotals:
+        rows = self.rows(filters, start, end)
+        clicks = int(self.store.clicks[rows].sum())
+        impressions = int(self.store.impressions[rows].sum())
+        position = float((self.store.position[rows] * self.store.impressions[rows]).sum())
+        return PeriodTotals(clicks, impressions, float(weighted(clicks * 100.0, impressions)),
+                            float(weighted(position, impressions)))
+
+    def breakdown(self, dimension: str, filters: Mapping[str, np.ndarray], start=None, end=None) -> pd.DataFrame:
+        """Sumy per wartość wymiaru dla wybranych wierszy, malejąco po kliknięciach."""
+        rows = self.rows(filters, start, end)
+        index = self.indexes[dimension]
+        codes = index.codes[rows]
+        size = len(index)
+        impressions = np.bincount(codes, weights=self.store.impressions[rows], minlength=size)
+        clicks = np.bincount(codes, weights=self.store.clicks[rows], minlength=size)
+        frame = pd.DataFrame({
+            dimension: index.labels,
+            "clicks": clicks.astype(np.int64),
+            "impressions": impressions.astype(np.int64),
+            "ctr": weighted(clicks * 100.0, impressions),
+            "position": weighted(np.bincount(codes, weights=self.store.position[rows] * self.store.impressions[rows],
+                                             minlength=size), impressions),
+        })
+        frame = frame[frame["impressions"] > 0]
+        return frame.sort_values("clicks", ascending=False, ignore_index=True)
+
+    def _bounds(self, start, end) -> tuple[int, int]:
+        if (start is None and end is None) or not len(self):
+            return 0, len(self)
+        dates = self.store.date
+        return self.store.bounds(dates[0] if start is None else start, dates[-1] if end is None else end)
+
+
+def _row_dtype(size: int) -> np.dtype:
+    return np.dtype(np.int32 if size < 2**31 else np.int64)
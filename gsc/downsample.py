@@ -0,0 +1,59 @@
+"""Zmniejszanie liczby punktów wykresów metodą LTTB (Largest-Triangle-Three-Buckets).
+
+Szereg dzielony jest na kubełki; z każdego zostaje punkt tworzący największy
+trójkąt z punktem wybranym w poprzednim kubełku i średnią następnego. Kształt
+linii (szczyty, spadki) zostaje zachowany przy liczbie punktów rzędu
+szerokości wykresu w pikselach.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from gsc.store import weighted
+
+# Punkty na serię wykresu - mniej więcej szerokość wykresu w pikselach w układzie "wide"
+# (Streamlit nie przekazuje szerokości elementu do skryptu)
+CHART_POINTS = 1000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indeksy (rosnąco) co najwyżej ``threshold`` punktów; pierwszy i ostatni zawsze zostają."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x).astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # threshold - 2 kubełków wewnętrznych między pierwszym a ostatnim punktem
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    valid = ~np.isnan(y[:-1])
+    counts = np.add.reduceat(valid.astype(np.int64), edges[:-1])
+    mean_x = weighted(np.add.reduceat(np.where(valid, x[:-1], 0.0), edges[:-1]), counts)
+    mean_y = weighted(np.add.reduceat(np.where(valid, y[:-1], 0.0), edges[:-1]), counts)
+    # "następny kubełek" ostatniego kubełka to ostatni punkt
+    mean_x, mean_y = np.r_[mean_x[1:], x[-1]], np.r_[mean_y[1:], y[-1]]
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        area = np.abs((x[a] - mean_x[bucket]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[bucket] - y[a]))
+        # braki (NaN) wybierane tylko, gdy w kubełku nie ma nic innego
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        selected[bucket + 1] = a
+    return selected
+
+
+def downsample(frame: pd.DataFrame, columns: Sequence[str], threshold: int, x: str = "date") -> pd.DataFrame:
+    """Wiersze wybrane przez LTTB dla każdej kolumny osobno (suma zbiorów, w kolejności osi x)."""
+    if len(frame) <= threshold:
+        return frame
+    xs = frame[x].to_numpy()
+    if np.issubdtype(xs.dtype, np.datetime64):
+        xs = xs.astype("datetime64[s]").astype(np.int64)
+    rows = np.unique(np.concatenate([lttb_indices(xs, frame[column].to_numpy(), threshold) for column in columns]))
+    return frame.iloc[rows]
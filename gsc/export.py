@@ -0,0 +1,186 @@
+"""Eksport przefiltrowanych wierszy do skompresowanego CSV albo Parquet.
+
+Magazyn jest zapisywany partiami po ``CHUNK_ROWS`` wierszy (``RecordBatch``
+z widoków na kolumny NumPy), więc pamięć zapisu nie zależy od wielkości
+wyniku: w pamięci jest naraz jedna partia i bufor kompresji. Wymiary idą
+jako słowniki Arrow ze wspólną listą etykiet - etykiety nie są kopiowane
+do każdej partii, a Parquet zapisuje je słownikowo w każdej grupie wierszy.
+
+``st.download_button`` trzyma cały plik w pamięci serwera, więc dashboard
+pobiera tylko wyniki do ``MAX_DOWNLOAD_ROWS`` wierszy. Większe zapisuje
+na dysk, partiami, wiersz poleceń::
+
+    python -m gsc.export --site https://example.com --range 2025-07-01:2025-09-30 --format parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import os
+import shlex
+import sys
+from pathlib import Path
+from typing import BinaryIO, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as csv
+import pyarrow.parquet as pq
+
+from gsc.cube import Cube
+from gsc.portfolio import load_site
+from gsc.report import parse_range
+from gsc.search import MODES, SearchIndex
+from gsc.store import TimeSeriesStore
+from gsc.warehouse import DEFAULT_ROOT as WAREHOUSE_ROOT
+
+CHUNK_ROWS = 65_536
+# Największy eksport do pobrania z dashboardu (plik trafia w całości do pamięci serwera)
+MAX_DOWNLOAD_ROWS = int(os.environ.get("GSC_EXPORT_MAX_ROWS", "500000"))
+GZIP_LEVEL = 6
+# rozszerzenie pliku, typ MIME
+FORMATS = {
+    "csv": ("csv.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def record_batches(store: TimeSeriesStore, chunk_rows: int = CHUNK_ROWS) -> Iterator[pa.RecordBatch]:
+    """Kolejne partie wierszy: data, wymiary, metryki."""
+    names = ["date", *store.dimensions, "clicks", "impressions", "ctr", "position"]
+    labels = {name: pa.array(np.asarray(store.columns[name].categories, dtype=object), type=pa.string())
+              for name in store.dimensions}
+    for lo in range(0, len(store), chunk_rows):
+        arrays = []
+        for name in names:
+            column = store.columns[name][lo:lo + chunk_rows]
+            if name in labels:
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(column.codes.astype(np.int32)), labels[name]))
+            elif name == "date":
+                arrays.append(pa.array(column, type=pa.date32()))
+            else:
+                arrays.append(pa.array(column))
+        yield pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def schema(store: TimeSeriesStore) -> pa.Schema:
+    return pa.schema([
+        ("date", pa.date32()),
+        *((name, pa.dictionary(pa.int32(), pa.string())) for name in store.dimensions),
+        *((name, pa.from_numpy_dtype(store.columns[name].dtype)) for name in ("clicks", "impressions", "ctr",
+                                                                              "position")),
+    ])
+
+
+def write_export(store: TimeSeriesStore, sink: str | Path | BinaryIO, fmt: str = "csv",
+                 chunk_rows: int = CHUNK_ROWS) -> int:
+    """Zapisuje magazyn partiami (CSV w gzip albo Parquet z zstd); zwraca liczbę wierszy."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Nieznany format eksportu: {fmt!r}")
+    rows = 0
+    if fmt == "csv":
+        # gzip z biblioteki standardowej: Arrow kompresuje zawsze na poziomie 9, kilka razy wolniej
+        with gzip.open(sink, "wb", compresslevel=GZIP_LEVEL) as stream, \
+                csv.CSVWriter(stream, schema(store)) as writer:
+            for batch in record_batches(store, chunk_rows):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    else:
+        with pq.ParquetWriter(str(sink) if isinstance(sink, Path) else sink, schema(store),
+                              compression="zstd") as writer:
+            for batch in record_batches(store, chunk_rows):
+                writer.write_batch(batch, row_group_size=chunk_rows)
+                rows += batch.num_rows
+    return rows
+
+
+def export_bytes(store: TimeSeriesStore, fmt: str = "csv") -> bytes:
+    """Cały eksport w pamięci - dla ``st.download_button``, który i tak trzyma plik w pamięci serwera.
+
+    Tylko dla wyników do ``MAX_DOWNLOAD_ROWS`` wierszy; większe zapisuje na dysk ``main``.
+    """
+    buffer = io.BytesIO()
+    write_export(store, buffer, fmt)
+    return buffer.getvalue()
+
+
+def select(data: dict, start, end, filters=()) -> TimeSeriesStore:
+    """Wiersze kostki witryny w zakresie dat po filtrach w postaci z dashboardu: ``(tryb, warunki)``.
+
+    Warunek strony/zapytania to wzorzec, kraju/urządzenia - lista wartości.
+    """
+    store = data["time_series"]
+    if not filters:
+        return store.slice(start, end)
+    mode, conditions = filters
+    cube = Cube(store)
+    masks = {}
+    for dimension, condition in conditions:
+        if dimension not in cube.dimensions:
+            raise ValueError(f"Brak wymiaru {dimension!r} w danych witryny")
+        labels = cube.labels(dimension)
+        if isinstance(condition, str):
+            masks[dimension] = SearchIndex(labels).match(labels, condition, mode)
+        else:
+            masks[dimension] = cube.indexes[dimension].value_mask(condition)
+    return store.take(cube.rows(masks, start, end))
+
+
+def command(site: str, start, end, fmt: str = "csv", filters=(), mock: bool = False) -> str:
+    """Polecenie ``python -m gsc.export`` zapisujące na dysk ten sam eksport co dashboard."""
+    args = ["python", "-m", "gsc.export", "--site", site,
+            "--range", f"{pd.Timestamp(start):%Y-%m-%d}:{pd.Timestamp(end):%Y-%m-%d}", "--format", fmt]
+    if filters:
+        mode, conditions = filters
+        for dimension, condition in conditions:
+            values = [condition] if isinstance(condition, str) else condition
+            args += [item for value in values for item in (f"--{dimension}", value)]
+        if any(isinstance(condition, str) for _, condition in conditions) and mode != MODES[0]:
+            args += ["--mode", mode]
+    if mock:
+        args.append("--mock")
+    return shlex.join(args)
+
+
+def file_name(site: str, start, end, fmt: str) -> str:
+    """Nazwa pliku do pobrania, np. ``example.com_2025-07-01_2025-09-30.csv.gz``."""
+    host = site.split("://", 1)[-1].removeprefix("sc-domain:").strip("/").replace("/", "_")
+    return f"{host}_{pd.Timestamp(start):%Y-%m-%d}_{pd.Timestamp(end):%Y-%m-%d}.{FORMATS[fmt][0]}"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m gsc.export", description=__doc__.splitlines()[0])
+    parser.add_argument("--site", required=True)
+    parser.add_argument("--range", required=True, type=parse_range, metavar="OD:DO", help="zakres dat")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--out", type=Path, default=None, help="plik wynikowy (domyślnie nazwa jak w dashboardzie)")
+    parser.add_argument("--page", help="wzorzec strony")
+    parser.add_argument("--query", help="wzorzec zapytania")
+    parser.add_argument("--mode", choices=MODES, default=MODES[0], help="tryb wzorców strony i zapytania")
+    parser.add_argument("--country", action="append", default=[], help="kraj (można powtarzać)")
+    parser.add_argument("--device", action="append", default=[], help="urządzenie (można powtarzać)")
+    parser.add_argument("--warehouse", type=Path, default=WAREHOUSE_ROOT, help="hurtownia Parquet")
+    parser.add_argument("--mock", action="store_true", help="dane demonstracyjne zamiast hurtowni")
+    args = parser.parse_args(argv)
+
+    start, end = args.range
+    conditions = tuple((dimension, pattern) for dimension in ("page", "query")
+                       if (pattern := getattr(args, dimension))) + \
+        tuple((dimension, tuple(values)) for dimension in ("country", "device")
+              if (values := getattr(args, dimension)))
+    data = load_site(args.site, None if args.mock else args.warehouse)
+    try:
+        store = select(data, start, end, (args.mode, conditions) if conditions else ())
+    except ValueError as exc:
+        parser.error(str(exc))
+    out = args.out or Path(file_name(args.site, start, end, args.format))
+    rows = write_export(store, out, args.format)
+    print(f"{out}: {rows} wierszy")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Pobieranie danych z Search Console (searchanalytics.query).
+
+Zakres dat jest dzielony na dni/tygodnie, każdy kawałek jest stronicowany
+przez ``startRow``/``rowLimit``, a kawałki idą równolegle w ograniczonej
+puli wątków. Transport jest wymienny: Google API client albo zwykłe HTTP
+(np. lokalny serwer udający GSC w testach). Odpowiedzi HTTP są parsowane
+strumieniowo prosto do kolumn (``gsc.ingest``).
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Iterator, Mapping, Sequence
+from urllib import error, parse, request
+
+import numpy as np
+
+from gsc.ingest import ColumnBuilder, TruncatedResponse, concat_columns
+from gsc.perf import propagate, stage
+from gsc.store import TimeSeriesStore, to_day
+from gsc.topk import top_k
+
+ROW_LIMIT = 25000
+# Długość list top stron/zapytań w podsumowaniu witryny (pełne tabele są stronicowane osobno)
+SUMMARY_ROWS = 100
+DEFAULT_DIMENSIONS = ("date", "page", "query")
+# Tabele witryny: wymiary i długość kawałka (dni) przy pobieraniu.
+# "cube" ma wszystkie wymiary naraz, więc kraje, urządzenia i tabele tną się razem (gsc.cube).
+# Z wymiarem strony/zapytania GSC pomija zanonimizowane zapytania i obcina liczbę wierszy na dzień,
+# więc sumy bez filtrów pochodzą z tabel na poziomie usługi ("countries", "devices").
+TABLES = {
+    "cube": (("date", "page", "query", "country", "device"), 1),
+    "countries": (("date", "country"), 31),
+    "devices": (("date", "device"), 31),
+}
+# Wymiar -> tabela z pełnymi sumami usługi
+AGGREGATE_TABLES = {"country": "countries", "device": "devices"}
+# GSC finalizuje dane z opóźnieniem - ostatnie dni są niefinalne ("fresh")
+FRESH_DAYS = 3
+# 0 - zerwane połączenie albo odpowiedź ucięta w połowie (bez kodu HTTP)
+RETRY_STATUSES = frozenset({0, 429, 500, 502, 503, 504})
+# Limit GSC: 1200 zapytań na minutę na witrynę
+QUERIES_PER_MINUTE = 1200
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+class TransportError(Exception):
+    """Błąd odpowiedzi API z kodem HTTP (0 - połączenie zerwane przed końcem odpowiedzi)."""
+
+    def __init__(self, status: int, message: str = ""):
+        super().__init__(f"HTTP {status}: {message}" if message else f"HTTP {status}")
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in RETRY_STATUSES or (self.status == 403 and "quota" in str(self).lower())
+
+
+class Transport:
+    """Interfejs transportu do API Search Console."""
+
+    def list_sites(self) -> list[str]:
+        raise NotImplementedError
+
+    def query(self, site_url: str, body: Mapping) -> dict:
+        raise NotImplementedError
+
+    def query_into(self, site_url: str, body: Mapping, builder: ColumnBuilder) -> int:
+        """Jedna strona wyników dopisana do ``builder``; zwraca liczbę wierszy."""
+        return builder.extend(self.query(site_url, body).get("rows", []))
+
+
+class HttpTransport(Transport):
+    """Transport REST po ``urllib``; ``base_url`` może wskazywać na lokalny fałszywy serwer."""
+
+    def __init__(self, base_url: str = "https://www.googleapis.com",
+                 token: str | Callable[[], str] | None = None, timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def list_sites(self) -> list[str]:
+        response = self._call("GET", "/webmasters/v3/sites")
+        return [entry["siteUrl"] for entry in response.get("siteEntry", [])]
+
+    def query(self, site_url: str, body: Mapping) -> dict:
+        return self._call("POST", self._query_path(site_url), body)
+
+    def query_into(self, site_url: str, body: Mapping, builder: ColumnBuilder) -> int:
+        """Strona wyników czytana ze strumienia odpowiedzi bez listy słowników dla całej strony."""
+        return self._call("POST", self._query_path(site_url), body, read=builder.feed)
+
+    @staticmethod
+    def _query_path(site_url: str) -> str:
+        return f"/webmasters/v3/sites/{parse.quote(site_url, safe='')}/searchAnalytics/query"
+
+    def _call(self, method: str, path: str, body: Mapping | None = None,
+              read: Callable[[BinaryIO], object] = json.load):
+        headers = {"Content-Type": "application/json"}
+        if self.token is not None:
+            token = self.token() if callable(self.token) else self.token
+            headers["Authorization"] = f"Bearer {token}"
+        data = None if body is None else json.dumps(body).encode()
+        req = request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with request.urlopen(req, timeout=self.timeout) as response:
+                return read(response)
+        except error.HTTPError as exc:
+            raise TransportError(exc.code, exc.read().decode(errors="replace")) from exc
+        except (OSError, http.client.HTTPException, TruncatedResponse) as exc:
+            # zerwane połączenie albo treść urwana przed końcem wierszy; _retry cofa dopisane z niej wiersze.
+            # Błędna treść (inny ValueError) nie zmieni się przy ponowieniu, więc idzie dalej od razu.
+            raise TransportError(0, f"{type(exc).__name__}: {exc}") from exc
+
+
+class GoogleApiTransport(Transport):
+    """Transport przez google-api-python-client (osobny klient na wątek - httplib2 nie jest wątkowo bezpieczny)."""
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self._local = threading.local()
+
+    @classmethod
+    def from_service_account_info(cls, info: Mapping) -> "GoogleApiTransport":
+        from google.oauth2 import service_account
+
+        scopes = ["https://www.googleapis.com/auth/webmasters.readonly"]
+        return cls(service_account.Credentials.from_service_account_info(dict(info), scopes=scopes))
+
+    @property
+    def service(self):
+        if not hasattr(self._local, "service"):
+            from googleapiclient.discovery import build
+
+            self._local.service = build("searchconsole", "v1", credentials=self.credentials,
+                                        cache_discovery=False)
+        return self._local.service
+
+    def list_sites(self) -> list[str]:
+        response = self._execute(self.service.sites().list())
+        return [entry["siteUrl"] for entry in response.get("siteEntry", [])]
+
+    def query(self, site_url: str, body: Mapping) -> dict:
+        return self._execute(self.service.searchanalytics().query(siteUrl=site_url, body=dict(body)))
+
+    @staticmethod
+    def _execute(call) -> dict:
+        from googleapiclient.errors import HttpError
+
+        try:
+            return call.execute()
+        except HttpError as exc:
+            raise TransportError(exc.resp.status, str(exc)) from exc
+
+
+def transport_from_config(config: Mapping | None) -> Transport | None:
+    """Transport z konfiguracji (np. ``st.secrets["gsc"]``); ``None`` gdy brak konfiguracji."""
+    if not config:
+        return None
+    if "service_account" in config:
+        return GoogleApiTransport.from_service_account_info(config["service_account"])
+    if "base_url" in config:
+        return HttpTransport(config["base_url"], token=config.get("token"))
+    raise ValueError("Konfiguracja GSC wymaga 'service_account' albo 'base_url'")
+
+
+class RateLimiter:
+    """Kubełek żetonów: najwyżej ``per_minute`` wywołań na minutę."""
+
+    def __init__(self, per_minute: float = QUERIES_PER_MINUTE, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / per_minute
+        self.capacity = max(1.0, per_minute / 60.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) * self.interval
+            self.sleep(wait)
+
+
+def date_chunks(start, end, days: int = 1) -> Iterator[tuple[np.datetime64, np.datetime64]]:
+    """Kolejne przedziały [od, do] po ``days`` dni (ostatni może być krótszy)."""
+    start, end = to_day(start), to_day(end)
+    step = np.timedelta64(days, "D")
+    while start <= end:
+        yield start, min(end, start + step - _ONE_DAY)
+        start += step
+
+
+class SearchAnalyticsFetcher:
+    """Równoległe, stronicowane pobieranie searchanalytics.query z limitem na witrynę."""
+
+    def __init__(self, transport: Transport, max_workers: int = 8, row_limit: int = ROW_LIMIT,
+                 per_minute: float = QUERIES_PER_MINUTE, retries: int = 5, backoff: float = 1.0,
+                 sleep=time.sleep):
+        self.transport = transport
+        self.max_workers = max_workers
+        self.row_limit = row_limit
+        self.per_minute = per_minute
+        self.retries = retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self._limiters: dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, site_url: str) -> RateLimiter:
+        with self._lock:
+            if site_url not in self._limiters:
+                self._limiters[site_url] = RateLimiter(self.per_minute, sleep=self.sleep)
+            return self._limiters[site_url]
+
+    def fetch(self, site_url: str, start, end, dimensions: Sequence[str] = DEFAULT_DIMENSIONS,
+              chunk_days: int = 1, data_state: str = "final") -> TimeSeriesStore:
+        """Pobiera zakres dat jako ``TimeSeriesStore`` z kolumnami wymiarów."""
+        dimensions = list(dimensions)
+        if "date" not in dimensions:
+            dimensions.insert(0, "date")
+        chunks = list(date_chunks(start, end, chunk_days))
+        with stage("fetch") as record, ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            fetch_chunk = propagate(self.fetch_chunk)
+            parts = list(pool.map(lambda chunk: fetch_chunk(site_url, *chunk, dimensions, data_state), chunks))
+            with stage("columns"):
+                store = TimeSeriesStore(concat_columns(parts, dimensions))
+            record.rows = len(store)
+            return store
+
+    def fetch_chunk(self, site_url: str, start, end, dimensions: Sequence[str],
+                    data_state: str = "final") -> dict:
+        """Wszystkie strony wyników dla jednego przedziału dat jako kolumny (``gsc.ingest``)."""
+        builder = ColumnBuilder(dimensions)
+        body = {
+            "startDate": str(to_day(start)),
+            "endDate": str(to_day(end)),
+            "dimensions": list(dimensions),
+            "rowLimit": self.row_limit,
+            "dataState": data_state,
+            "startRow": 0,
+        }
+        with stage("chunk") as record:
+            while True:
+                rows = self.query_into(site_url, body, builder)
+                if rows < self.row_limit:
+                    break
+                body = {**body, "startRow": body["startRow"] + rows}
+            record.rows = len(builder)
+            return builder.columns()
+
+    def query(self, site_url: str, body: Mapping) -> dict:
+        """Jedno wywołanie z limitem zapytań i wykładniczym ponawianiem."""
+        return self._retry(site_url, lambda: self.transport.query(site_url, body))
+
+    def query_into(self, site_url: str, body: Mapping, builder: ColumnBuilder) -> int:
+        """Jak ``query``, ale wiersze trafiają do ``builder``; przerwana strona jest cofana przed ponowieniem."""
+        size = len(builder)
+        return self._retry(site_url, lambda: self.transport.query_into(site_url, body, builder),
+                           undo=lambda: builder.truncate(size))
+
+    def _retry(self, site_url: str, call: Callable, undo: Callable[[], None] | None = None):
+        limiter = self.limiter(site_url)
+        attempt = 0
+        while True:
+            limiter.acquire()
+            try:
+                return call()
+            except TransportError as exc:
+                if undo is not None:
+                    undo()
+                if not exc.retryable or attempt >= self.retries:
+                    raise
+            self.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+            attempt += 1
+
+
+def fetch_tables(fetcher: SearchAnalyticsFetcher, site_url: str, start, end,
+                 data_state: str = "final") -> dict[str, TimeSeriesStore]:
+    """Wszystkie tabele z ``TABLES`` dla zakresu dat."""
+    return {
+        name: fetcher.fetch(site_url, start, end, dimensions, chunk_days=chunk_days, data_state=data_state)
+        for name, (dimensions, chunk_days) in TABLES.items()
+    }
+
+
+def site_data(tables: Mapping[str, TimeSeriesStore]) -> dict:
+    """Dane witryny w układzie ``gsc.mock.mock_data`` plus tabele usługi w ``aggregates``.
+
+    Bez tabel usługi (np. dane syntetyczne) ich miejsce zajmuje kostka.
+    """
+    store = tables["cube"]
+    aggregates = {dimension: tables.get(name, store) for dimension, name in AGGREGATE_TABLES.items()}
+    return {
+        "time_series": store,
+        "aggregates": aggregates,
+        "country_data": aggregates["country"].totals_by("country").drop(columns="position"),
+        "top_pages": top_k(store.totals_by("page", sort=False), "clicks", SUMMARY_ROWS),
+        "top_queries": top_k(store.totals_by("query", sort=False), "clicks", SUMMARY_ROWS),
+        "device_data": aggregates["device"].totals_by("device").drop(columns=["ctr", "position"]),
+    }
+
+
+def property_store(data: Mapping, dimension: str = "country") -> TimeSeriesStore:
+    """Szereg z pełnymi sumami usługi (tabela z wymiarem ``dimension``); bez niej - ``time_series``."""
+    return data.get("aggregates", {}).get(dimension, data["time_series"])
+
+
+def fetch_site_data(fetcher: SearchAnalyticsFetcher, site_url: str, start, end) -> dict:
+    return site_data(fetch_tables(fetcher, site_url, start, end))
@@ -0,0 +1,222 @@
+"""Strumieniowe parsowanie odpowiedzi searchanalytics.query prosto do kolumn.
+
+Strona wyników (do 25 tys. wierszy) nie jest zamieniana w całości na listę
+słowników: odpowiedź jest czytana kawałkami, z każdego dekodowane są tylko
+kompletne wiersze i od razu zrzucane do rosnących buforów NumPy. Wartości
+wymiarów są kodowane w locie (słownik etykieta -> kod), więc z każdego
+ciągu zostaje najwyżej jedna kopia, a kolumna wymiaru to od razu kody plus
+etykiety. Daty to też kody (kilkaset różnych dni), zamieniane na datetime64
+na końcu. Jeśli jest zainstalowany ``orjson``, dekoduje on kawałki zamiast
+modułu ``json``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import BinaryIO, Iterable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from gsc.store import TimeSeriesStore
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+# Ile bajtów odpowiedzi czytać (i najwyżej dekodować) naraz
+READ_SIZE = 1 << 16
+
+_METRICS = {"clicks": np.int32, "impressions": np.int32, "ctr": np.float32, "position": np.float32}
+_ROWS = re.compile(rb'"rows"\s*:\s*\[')
+_SEPARATORS = b", \t\r\n"
+# Początek wiersza: klamra i klucz "keys". W ciągu znaków nie wystąpi - cudzysłów po "{"
+# kończyłby ciąg, a po nim nie może stać tekst; sama wartość "keys" nie ma przed sobą klamry.
+_ROW_START = re.compile(rb'\{\s*"keys"\s*:')
+_DECODER = json.JSONDecoder()
+# Urwane literały, liczby ("1.", "2e-", "-") i ucieczka \uXXXX (dekoder wskazuje na "u")
+_LITERALS = ("true", "false", "null")
+_CUT_NUMBER = re.compile(r"-|\.|[eE][-+]?")
+_CUT_ESCAPE = re.compile(r"u[0-9a-fA-F]{0,3}")
+
+
+class TruncatedResponse(ValueError):
+    """Odpowiedź skończyła się przed zamknięciem obiektu albo tablicy wierszy (np. zerwane połączenie)."""
+
+
+def _decode_end(data: bytes):
+    """Dekoduje ostatni fragment odpowiedzi; błąd z powodu końca danych to ``TruncatedResponse``."""
+    try:
+        text = data.decode()
+    except UnicodeDecodeError as exc:
+        if exc.reason != "unexpected end of data":
+            raise
+        raise TruncatedResponse(f"Odpowiedź urwana w środku znaku: {exc}") from exc
+    try:
+        return _DECODER.raw_decode(text)[0]
+    except json.JSONDecodeError as exc:
+        rest = exc.doc[exc.pos:].strip()
+        # niedomknięty ciąg, urwana ucieczka, liczba albo literał, albo nic po ostatnim znaku
+        if (exc.msg.startswith("Unterminated string")
+                or (exc.msg.startswith("Invalid \\u") and _CUT_ESCAPE.fullmatch(rest))
+                or _CUT_NUMBER.fullmatch(rest) or any(word.startswith(rest) for word in _LITERALS)):
+            raise TruncatedResponse(f"Odpowiedź urwana: {exc}") from exc
+        raise
+
+
+class GrowableArray:
+    """Bufor NumPy z dopisywaniem w czasie zamortyzowanym stałym (pojemność rośnie dwukrotnie)."""
+
+    __slots__ = ("_data", "_size")
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    def extend(self, values) -> None:
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._size + len(values)
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:end] = values
+        self._size = end
+
+    def truncate(self, size: int) -> None:
+        self._size = min(self._size, size)
+
+    def array(self) -> np.ndarray:
+        """Kopia dopisanych wartości bez zapasu pojemności."""
+        return self._data[:self._size].copy()
+
+
+class Dictionary:
+    """Kody wartości w kolejności pierwszego wystąpienia."""
+
+    __slots__ = ("index", "codes")
+
+    def __init__(self):
+        self.index: dict[str, int] = {}
+        self.codes = GrowableArray(np.int32)
+
+    def extend(self, values: Iterable[str]) -> None:
+        # haszowanie partii w pandas, słownik Pythona tylko dla jej unikalnych wartości
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        index = self.index
+        # len(index) jest liczone przed wstawieniem, więc nowa wartość dostaje kolejny kod
+        mapping = np.fromiter((index.setdefault(value, len(index)) for value in uniques), dtype=np.int32,
+                              count=len(uniques))
+        self.codes.extend(mapping[codes])
+
+    @property
+    def labels(self) -> list[str]:
+        return list(self.index)
+
+
+class ColumnBuilder:
+    """Wiersze odpowiedzi API dopisywane do kolumn magazynu (CTR z ułamka na procenty)."""
+
+    def __init__(self, dimensions: Sequence[str]):
+        self.dimensions = tuple(dimensions)
+        self._keys = {name: Dictionary() for name in self.dimensions}
+        self._metrics = {name: GrowableArray(dtype) for name, dtype in _METRICS.items()}
+
+    def __len__(self) -> int:
+        return len(self._metrics["clicks"])
+
+    def extend(self, rows: Sequence[Mapping]) -> int:
+        """Dopisuje zdekodowane wiersze; zwraca ich liczbę."""
+        count = len(rows)
+        if not count:
+            return 0
+        for dictionary, values in zip(self._keys.values(), zip(*(row["keys"] for row in rows))):
+            dictionary.extend(values)
+        for name, buffer in self._metrics.items():
+            buffer.extend(np.fromiter((row[name] for row in rows), dtype=buffer.dtype, count=count))
+        return count
+
+    def feed(self, stream: BinaryIO, read_size: int = READ_SIZE) -> int:
+        """Dopisuje wiersze z odpowiedzi JSON czytanej kawałkami; zwraca ich liczbę.
+
+        Treść urwana przed zamknięciem odpowiedzi albo tablicy wierszy to ``TruncatedResponse``;
+        błędna treść - zwykły ``ValueError``.
+        """
+        buffer, in_rows, added = b"", False, 0
+        while True:
+            chunk = stream.read(read_size)
+            buffer += chunk
+            if not in_rows:
+                # klucz mógł zostać przecięty granicą kawałka
+                match = _ROWS.search(buffer, max(0, len(buffer) - len(chunk) - 16))
+                if match is None:
+                    if not chunk:
+                        # odpowiedź bez wierszy (kilka pól) - pusta albo kompletny obiekt
+                        if buffer.strip():
+                            _decode_end(buffer.strip())
+                        return added
+                    continue
+                buffer, in_rows = buffer[match.end():], True
+            if not chunk:
+                # reszta tablicy wierszy; raw_decode kończy na jej nawiasie zamykającym
+                return added + self.extend(_decode_end(b"[" + buffer.lstrip(_SEPARATORS)))
+            # wszystkie wiersze przed początkiem ostatniego są kompletne
+            cut = -1
+            for match in _ROW_START.finditer(buffer):
+                cut = match.start()
+            if cut > 0:
+                region = buffer[:cut].strip(_SEPARATORS)
+                if region:
+                    added += self.extend(loads(b"[" + region + b"]"))
+                buffer = buffer[cut:]
+
+    def truncate(self, size: int) -> None:
+        """Cofa dopisane wiersze do ``size`` (np. przed ponowieniem przerwanej strony)."""
+        for dictionary in self._keys.values():
+            dictionary.codes.truncate(size)
+        for buffer in self._metrics.values():
+            buffer.truncate(size)
+
+    def columns(self) -> dict:
+        """Kolumny w układzie ``TimeSeriesStore`` (wymiary jako ``pd.Categorical``)."""
+        columns = {}
+        for name, dictionary in self._keys.items():
+            codes = dictionary.codes.array()
+            if name == "date":
+                columns[name] = np.array(dictionary.labels, dtype="datetime64[D]")[codes]
+            else:
+                columns[name] = pd.Categorical.from_codes(codes, categories=pd.Index(dictionary.labels, dtype=object))
+        columns.update((name, buffer.array()) for name, buffer in self._metrics.items())
+        columns["ctr"] *= 100.0
+        return columns
+
+
+def concat_columns(parts: Sequence[Mapping], dimensions: Sequence[str]) -> dict:
+    """Skleja kolumny kilku buforów; słowniki wymiarów są łączone bez dekodowania do ciągów."""
+    if not parts:
+        return ColumnBuilder(dimensions).columns()
+    columns = {}
+    for name in parts[0]:
+        values = [part[name] for part in parts]
+        if isinstance(values[0], pd.Categorical):
+            columns[name] = union_categoricals(values) if len(values) > 1 else values[0]
+        else:
+            columns[name] = np.concatenate(values)
+    return columns
+
+
+def parse_response(stream: BinaryIO, dimensions: Sequence[str]) -> TimeSeriesStore:
+    """Jedna odpowiedź API (plik albo strumień HTTP) jako magazyn."""
+    builder = ColumnBuilder(dimensions)
+    builder.feed(stream)
+    return TimeSeriesStore(builder.columns())
@@ -0,0 +1,66 @@
+"""Dane demonstracyjne - rozszerzone do 16 miesięcy."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from gsc.store import TimeSeriesStore
+
+START_DATE = np.datetime64("2024-06-01")
+END_DATE = np.datetime64("2025-09-30")
+
+
+def generate_mock_data(rng: np.random.Generator | None = None) -> TimeSeriesStore:
+    """Tygodniowe punkty z trendem wzrostowym kliknięć i poprawą pozycji."""
+    rng = rng or np.random.default_rng()
+    dates = np.arange(START_DATE, END_DATE + 1, 7)
+    progress = (dates - START_DATE) / (END_DATE - START_DATE)
+    base_clicks = 400 + rng.random(len(dates)) * 200
+    trend = progress * 600
+
+    return TimeSeriesStore({
+        "date": dates,
+        "clicks": np.round(base_clicks + trend + rng.random(len(dates)) * 100),
+        "impressions": np.round((base_clicks + trend) * 25 + rng.random(len(dates)) * 3000),
+        "ctr": 3.5 + rng.random(len(dates)) * 1.5,
+        "position": 9 - progress * 4,
+    }, presorted=True)
+
+
+def mock_data(rng: np.random.Generator | None = None) -> dict:
+    return {
+        "time_series": generate_mock_data(rng),
+        "country_data": pd.DataFrame([
+            {"country": "Polska", "clicks": 8500, "impressions": 185000, "ctr": 4.59},
+            {"country": "USA", "clicks": 1200, "impressions": 32000, "ctr": 3.75},
+            {"country": "Niemcy", "clicks": 950, "impressions": 28000, "ctr": 3.39},
+            {"country": "UK", "clicks": 720, "impressions": 21000, "ctr": 3.43},
+            {"country": "Francja", "clicks": 580, "impressions": 18500, "ctr": 3.14},
+        ]),
+        "top_pages": pd.DataFrame([
+            {"page": "/blog/seo-tips-2025", "clicks": 2100, "impressions": 45000, "ctr": 4.67, "position": 4.2},
+            {"page": "/produkty/kategoria-a", "clicks": 1850, "impressions": 42000, "ctr": 4.40, "position": 5.1},
+            {"page": "/", "clicks": 1600, "impressions": 38000, "ctr": 4.21, "position": 3.8},
+            {"page": "/blog/marketing-content", "clicks": 1320, "impressions": 35000, "ctr": 3.77, "position": 6.3},
+            {"page": "/uslugi", "clicks": 1100, "impressions": 28000, "ctr": 3.93, "position": 5.8},
+            {"page": "/blog/google-analytics", "clicks": 980, "impressions": 25000, "ctr": 3.92, "position": 7.1},
+            {"page": "/kontakt", "clicks": 850, "impressions": 22000, "ctr": 3.86, "position": 8.2},
+            {"page": "/o-nas", "clicks": 720, "impressions": 19000, "ctr": 3.79, "position": 6.9},
+        ]),
+        "top_queries": pd.DataFrame([
+            {"query": "optymalizacja seo", "clicks": 1250, "impressions": 28000, "ctr": 4.46, "position": 4.5},
+            {"query": "marketing internetowy", "clicks": 1120, "impressions": 26500, "ctr": 4.23, "position": 5.2},
+            {"query": "pozycjonowanie stron", "clicks": 980, "impressions": 24000, "ctr": 4.08, "position": 6.1},
+            {"query": "content marketing", "clicks": 850, "impressions": 21000, "ctr": 4.05, "position": 5.8},
+            {"query": "analityka google", "clicks": 720, "impressions": 19000, "ctr": 3.79, "position": 6.5},
+            {"query": "social media marketing", "clicks": 650, "impressions": 17500, "ctr": 3.71, "position": 7.2},
+            {"query": "strategia seo", "clicks": 580, "impressions": 15800, "ctr": 3.67, "position": 7.8},
+            {"query": "reklama google ads", "clicks": 520, "impressions": 14200, "ctr": 3.66, "position": 8.1},
+        ]),
+        "device_data": pd.DataFrame([
+            {"device": "Mobile", "clicks": 5800, "impressions": 135000},
+            {"device": "Desktop", "clicks": 4200, "impressions": 98000},
+            {"device": "Tablet", "clicks": 1000, "impressions": 25000},
+        ]),
+    }
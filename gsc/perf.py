@@ -0,0 +1,256 @@
+"""Pomiar etapów jednego przebiegu (rerun): czas, liczba wierszy, szczyt pamięci.
+
+``trace()`` obejmuje cały przebieg, ``stage(nazwa)`` jego fragmenty - także w
+modułach ``gsc`` i w wątkach puli, o ile zadanie opakowano ``propagate``.
+Poza ``trace()`` etapy nic nie kosztują. Szczyt pamięci (``tracemalloc``) jest
+mierzony tylko na życzenie, bo spowalnia alokacje; jest liczony dla całego
+procesu, więc przy równoległych sesjach obejmuje też ich alokacje.
+
+``PerfLog`` zbiera przebiegi procesu: percentyle per etap, log JSON Lines i
+plik tekstowy dla node_exportera (Prometheus).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+LOG_PATH = os.environ.get("GSC_PERF_LOG")
+TEXTFILE = os.environ.get("GSC_PERF_TEXTFILE")
+# Jak często (s) przepisywać plik dla Prometheusa
+TEXTFILE_INTERVAL = 15.0
+QUANTILES = (0.5, 0.95, 0.99)
+HELP = {"gsc_rerun_seconds": "Czas przebiegu dashboardu.", "gsc_stage_seconds": "Czas etapu przebiegu."}
+
+_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("gsc_perf_trace", default=None)
+_path: contextvars.ContextVar[tuple[str, ...]] = contextvars.ContextVar("gsc_perf_path", default=())
+# Liczba przebiegów mierzących pamięć - tracemalloc działa, dopóki choć jeden trwa
+_memory_traces = 0
+_memory_lock = threading.Lock()
+
+
+class Trace:
+    """Etapy jednego przebiegu; powtórzenia tej samej ścieżki etapów są sumowane."""
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.thread = threading.get_ident()
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.stages: dict[tuple[str, ...], list] = {}
+        # pamięć na początku i bieżący szczyt każdego otwartego etapu (stos wg zagnieżdżenia)
+        self._bases: list[int] = []
+        self._peaks: list[int] = []
+        self._lock = threading.Lock()
+
+    def open(self, path: tuple[str, ...]) -> None:
+        """Rezerwuje miejsce etapu przy jego starcie, więc rodzic stoi przed dziećmi."""
+        with self._lock:
+            self.stages.setdefault(path, [0, 0.0, None, None])
+
+    def add(self, path: tuple[str, ...], seconds: float, rows: int | None, peak: int | None) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(path, [0, 0.0, None, None])
+            entry[0] += 1
+            entry[1] += seconds
+            if rows is not None:
+                entry[2] = (entry[2] or 0) + rows
+            if peak is not None:
+                entry[3] = max(entry[3] or 0, peak)
+
+    def frame(self) -> pd.DataFrame:
+        """Etapy w kolejności rozpoczęcia: ścieżka, głębokość, wywołania, sekundy, wiersze, szczyt pamięci."""
+        with self._lock:
+            rows = [(" / ".join(path), len(path) - 1, calls, seconds, rows, peak)
+                    for path, (calls, seconds, rows, peak) in self.stages.items()]
+        frame = pd.DataFrame(rows, columns=["stage", "depth", "calls", "seconds", "rows", "peak_bytes"])
+        return frame.astype({"rows": "Int64", "peak_bytes": "Int64"})
+
+
+@contextmanager
+def trace(memory: bool = False) -> Iterator[Trace]:
+    """Przebieg z pomiarem etapów (``memory`` włącza ``tracemalloc`` na czas przebiegu)."""
+    global _memory_traces
+    current = Trace(memory)
+    if memory:
+        with _memory_lock:
+            _memory_traces += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+    token = _trace.set(current)
+    try:
+        yield current
+    finally:
+        _trace.reset(token)
+        current.seconds = time.perf_counter() - current.started
+        if memory:
+            with _memory_lock:
+                _memory_traces -= 1
+                if not _memory_traces:
+                    tracemalloc.stop()
+
+
+def current_trace() -> Trace | None:
+    """Trwający przebieg w bieżącym kontekście (``None`` poza ``trace()``)."""
+    return _trace.get()
+
+
+@contextmanager
+def stage(name: str, rows: int | None = None) -> Iterator[SimpleNamespace]:
+    """Etap przebiegu; liczbę wierszy można ustawić w trakcie (``as s: s.rows = ...``)."""
+    current = _trace.get()
+    record = SimpleNamespace(rows=rows)
+    if current is None:
+        yield record
+        return
+    path = _path.get() + (name,)
+    token = _path.set(path)
+    current.open(path)
+    memory = current.memory and tracemalloc.is_tracing() and threading.get_ident() == current.thread
+    if memory:
+        size, peak = tracemalloc.get_traced_memory()
+        if current._peaks:
+            # szczyt rodzica sprzed startu dziecka
+            current._peaks[-1] = max(current._peaks[-1], peak)
+        current._bases.append(size)
+        current._peaks.append(size)
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        seconds = time.perf_counter() - started
+        _path.reset(token)
+        peak = None
+        if memory:
+            top = max(current._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            peak = max(0, top - current._bases.pop())
+            if current._peaks:
+                current._peaks[-1] = max(current._peaks[-1], top)
+        current.add(path, seconds, record.rows, peak)
+
+
+def timed(name: str, compute: Callable[[], object]) -> object:
+    """``compute()`` jako etap; liczba wierszy z ``len`` wyniku, jeśli się da."""
+    with stage(name) as record:
+        result = compute()
+        try:
+            record.rows = len(result)
+        except TypeError:
+            pass
+        return result
+
+
+def propagate(fn: Callable) -> Callable:
+    """Funkcja do puli wątków: wykona się w kopii bieżącego kontekstu (przebieg i ścieżka etapów)."""
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class PerfLog:
+    """Ostatnie przebiegi procesu i eksport (JSON Lines, plik tekstowy Prometheusa)."""
+
+    def __init__(self, maxlen: int = 1000, log_path: str | Path | None = LOG_PATH,
+                 textfile: str | Path | None = TEXTFILE, textfile_interval: float = TEXTFILE_INTERVAL):
+        self.log_path = log_path
+        self.textfile = textfile
+        self.textfile_interval = textfile_interval
+        self._reruns: deque[tuple[float, dict[str, float]]] = deque(maxlen=maxlen)
+        # sumy i liczniki od startu procesu (dla _sum/_count)
+        self._totals: dict[str, list] = {}
+        self._written = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, current: Trace) -> None:
+        stages = {}
+        for path, (calls, seconds, _, _) in current.stages.items():
+            stages[" / ".join(path)] = seconds
+        with self._lock:
+            self._reruns.append((current.seconds, stages))
+            for name, seconds in (("rerun", current.seconds), *stages.items()):
+                total = self._totals.setdefault(name, [0, 0.0])
+                total[0] += 1
+                total[1] += seconds
+            write_textfile = self.textfile and time.monotonic() - self._written >= self.textfile_interval
+            if write_textfile:
+                self._written = time.monotonic()
+        if self.log_path:
+            frame = current.frame().drop(columns="depth").astype(object)
+            line = {"time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "seconds": current.seconds,
+                    "stages": frame.where(frame.notna(), None).to_dict("records")}
+            with open(self.log_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(line, default=_json_default) + "\n")
+        if write_textfile:
+            self.write_textfile()
+
+    def summary(self) -> pd.DataFrame:
+        """Percentyle czasu per etap z ostatnich przebiegów (``rerun`` = cały przebieg)."""
+        with self._lock:
+            samples: dict[str, list[float]] = {"rerun": [seconds for seconds, _ in self._reruns]}
+            for _, stages in self._reruns:
+                for name, seconds in stages.items():
+                    samples.setdefault(name, []).append(seconds)
+        rows = []
+        for name, values in samples.items():
+            if values:
+                quantiles = np.quantile(values, QUANTILES)
+                rows.append((name, len(values), *quantiles, max(values)))
+        columns = ["stage", "count", *(f"p{round(q * 100)}" for q in QUANTILES), "max"]
+        return pd.DataFrame(rows, columns=columns)
+
+    def prometheus(self) -> str:
+        """Format tekstowy Prometheusa: summary z kwantylami okna oraz _sum/_count od startu."""
+        summary = self.summary()
+        with self._lock:
+            totals = {name: tuple(total) for name, total in self._totals.items()}
+        lines, described = [], set()
+        # "rerun" jest pierwszym wierszem, więc próbki każdej rodziny stoją pod jej HELP/TYPE
+        for row in summary.itertuples(index=False):
+            metric, labels = ("gsc_rerun_seconds", "") if row.stage == "rerun" else \
+                ("gsc_stage_seconds", f'stage="{_label(row.stage)}",')
+            if metric not in described:
+                described.add(metric)
+                lines += [f"# HELP {metric} {HELP[metric]}", f"# TYPE {metric} summary"]
+            for q in QUANTILES:
+                lines.append(f'{metric}{{{labels}quantile="{q}"}} {getattr(row, f"p{round(q * 100)}"):.6f}')
+            count, total = totals.get(row.stage, (0, 0.0))
+            braces = f"{{{labels.rstrip(',')}}}" if labels else ""
+            lines.append(f"{metric}_sum{braces} {total:.6f}")
+            lines.append(f"{metric}_count{braces} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self) -> None:
+        path = Path(self.textfile)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.prometheus())
+        os.replace(tmp, path)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _json_default(value):
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} nie jest serializowalny")
@@ -0,0 +1,108 @@
+"""Widok portfela: równoległe podsumowania wielu witryn w puli procesów."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from gsc.compare import compare_totals, entity_deltas, top_movers
+from gsc.fetch import property_store, site_data
+from gsc.mock import mock_data
+from gsc.synthetic import DEMO_ROWS, synthetic_data
+from gsc.topk import top_k
+from gsc.totals import PrefixSumIndex
+
+TOP_N = 10
+
+
+def mp_context():
+    """Kontekst puli procesów: ``forkserver``, a bez niego ``spawn`` - nigdy ``fork``.
+
+    ``fork`` kopiuje wielowątkowy serwer Streamlit razem z zajętymi przez inne wątki
+    blokadami, więc proces potomny może się zawiesić. Serwer procesów startuje czysty,
+    z raz zaimportowanymi modułami obliczeń, i tylko on forkuje robotników.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" not in methods:
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["gsc.portfolio"])
+    return context
+
+
+def load_site(site: str, warehouse_root: str | Path | None = None) -> dict:
+    """Dane witryny z hurtowni albo (bez hurtowni) powtarzalne dane demonstracyjne.
+
+    Przy ``GSC_DEMO_ROWS`` > 0 dane demonstracyjne są syntetyczne, z wymiarami i w zadanej skali.
+    """
+    if warehouse_root is None:
+        seed = zlib.crc32(site.encode())
+        if DEMO_ROWS:
+            return synthetic_data(DEMO_ROWS, seed=seed)
+        return mock_data(np.random.default_rng(seed))
+    from gsc.warehouse import Warehouse
+
+    return site_data(Warehouse(warehouse_root).snapshot_all(site))
+
+
+def summarize_site(site: str, start, end, warehouse_root: str | Path | None = None, top_n: int = TOP_N) -> dict:
+    """Sumy, zmiany, trend miesięczny i top listy jednej witryny (wynik mały i piklowalny)."""
+    return summarize(load_site(site, warehouse_root), site, start, end, top_n)
+
+
+def summarize(data: dict, site: str, start, end, top_n: int = TOP_N) -> dict:
+    """``summarize_site`` dla już wczytanych danych."""
+    store = data["time_series"]
+    totals = compare_totals(PrefixSumIndex(property_store(data)), start, end)
+    window = store.slice(start, end)
+    summary = {
+        "site": site,
+        **totals["current"].to_dict(),
+        **{f"{metric}_change": change for metric, change in totals["change_previous"].items()},
+        "trend": property_store(data).slice(start, end).rollup("month")["clicks"].tolist(),
+    }
+    for dimension, fallback in (("page", "top_pages"), ("query", "top_queries")):
+        if dimension in store.dimensions:
+            top = top_k(window.totals_by(dimension, sort=False), "clicks", top_n)
+            winners, losers = top_movers(entity_deltas(store, dimension, start, end), n=top_n)
+        else:
+            top = data[fallback].head(top_n)
+            winners = losers = top.iloc[:0]
+        summary[fallback] = top.assign(site=site)
+        summary[f"{dimension}_winners"] = winners.assign(site=site)
+        summary[f"{dimension}_losers"] = losers.assign(site=site)
+    return summary
+
+
+def summarize_portfolio(sites: Sequence[str], start, end, warehouse_root: str | Path | None = None,
+                        max_workers: int | None = None, top_n: int = TOP_N) -> list[dict]:
+    """Podsumowania wszystkich witryn naraz - po jednej witrynie na proces."""
+    if not sites:
+        return []
+    workers = min(len(sites), max_workers or os.cpu_count() or 1)
+    root = None if warehouse_root is None else str(warehouse_root)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context()) as pool:
+        futures = [pool.submit(summarize_site, site, start, end, root, top_n) for site in sites]
+        return [future.result() for future in futures]
+
+
+def portfolio_table(summaries: Sequence[dict]) -> pd.DataFrame:
+    """Jedna linia na witrynę: sumy, zmiany i trend."""
+    columns = ["site", "clicks", "impressions", "ctr", "position",
+               "clicks_change", "impressions_change", "ctr_change", "position_change", "trend"]
+    return pd.DataFrame([{name: summary[name] for name in columns} for summary in summaries], columns=columns)
+
+
+def cross_site_top(summaries: Sequence[dict], key: str, metric: str = "clicks", n: int = TOP_N) -> pd.DataFrame:
+    """Top n po wszystkich witrynach; dokładny, bo każda witryna oddała swoje top n."""
+    frames = [summary[key] for summary in summaries if len(summary[key])]
+    if not frames:
+        return pd.DataFrame()
+    return top_k(pd.concat(frames, ignore_index=True), metric, n, descending=not key.endswith("_losers"))
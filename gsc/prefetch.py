@@ -0,0 +1,147 @@
+"""Rozgrzewanie zbiorów witryn w tle, zanim użytkownik w nie kliknie.
+
+``SiteUsage`` pamięta w pliku JSON, które witryny i kiedy były otwierane;
+``ranking`` stawia na początku ostatnio oglądaną, potem najczęściej używane.
+``Prefetcher`` wykonuje zadania w wątkach w tle w kolejności priorytetu -
+każdy klucz (witryna) jest w kolejce najwyżej raz, a ponowne zgłoszenie może
+tylko podnieść jego priorytet; klucz zakończony niedawno (``max_age``) jest
+pomijany. Zadanie to zwykle ta sama funkcja, którą woła kliknięcie w witrynę:
+rejestr zbiorów ma blokadę per witryna, więc kliknięcie w trakcie rozgrzewania
+czeka na wynik z tła zamiast liczyć go drugi raz.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Hashable, Sequence
+
+USAGE_PATH = Path(os.environ.get("GSC_USAGE", ".gsc_usage.json"))
+# Ile witryn z początku rankingu rozgrzewać po zalogowaniu
+PREFETCH_SITES = int(os.environ.get("GSC_PREFETCH_SITES", "3"))
+# Wątki w tle; pobieranie z API ma własną pulę, więc wystarczy ich niewiele
+WORKERS = 2
+
+
+class SiteUsage:
+    """Liczba otwarć i czas ostatniego otwarcia każdej witryny (zapisywane na dysk, jeśli podano ścieżkę)."""
+
+    def __init__(self, path: str | Path | None = USAGE_PATH):
+        self.path = None if path is None else Path(path)
+        self._lock = threading.Lock()
+        self._sites: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if self.path is None:
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def record(self, site: str, now: float | None = None) -> None:
+        with self._lock:
+            entry = self._sites.setdefault(site, {"views": 0, "last": 0.0})
+            entry["views"] += 1
+            entry["last"] = time.time() if now is None else now
+            text = json.dumps(self._sites)
+        if self.path is not None:
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(text)
+            os.replace(tmp, self.path)
+
+    def ranking(self, sites: Sequence[str]) -> list[str]:
+        """``sites`` w kolejności rozgrzewania: ostatnio oglądana, potem malejąco po liczbie otwarć.
+
+        Nieoglądane witryny zostają na końcu w kolejności z listy.
+        """
+        with self._lock:
+            usage = {site: dict(self._sites[site]) for site in sites if site in self._sites}
+        last = max(usage, key=lambda site: usage[site]["last"], default=None)
+        rest = sorted((site for site in sites if site != last),
+                      key=lambda site: -usage[site]["views"] if site in usage else 0)
+        return ([last] if last is not None else []) + rest
+
+
+class Prefetcher:
+    """Kolejka priorytetowa zadań w tle (mniejszy priorytet - wcześniej), jedno zadanie na klucz."""
+
+    def __init__(self, workers: int = WORKERS):
+        self.workers = workers
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._jobs: dict[Hashable, tuple[float, Callable[[], object]]] = {}
+        self._states: dict[Hashable, str] = {}
+        self._errors: dict[Hashable, BaseException] = {}
+        self._finished: dict[Hashable, float] = {}
+        self._order = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._ready = threading.Condition()
+
+    def submit(self, key: Hashable, job: Callable[[], object], priority: float = 0,
+               max_age: float | None = None) -> bool:
+        """Dodaje zadanie; ``False``, gdy klucz już trwa albo czeka z tym samym lub wyższym priorytetem.
+
+        Przy ``max_age`` także wtedy, gdy klucz zakończył się sukcesem mniej niż ``max_age`` sekund temu.
+        """
+        with self._ready:
+            state = self._states.get(key)
+            if state == "running" or (state == "queued" and self._jobs[key][0] <= priority):
+                return False
+            if state == "done" and max_age is not None and time.monotonic() - self._finished[key] < max_age:
+                return False
+            # poprzedni wpis na stercie zostaje i jest pomijany przy zdjęciu
+            self._jobs[key] = (priority, job)
+            self._states[key] = "queued"
+            self._errors.pop(key, None)
+            heapq.heappush(self._heap, (priority, next(self._order), key))
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"gsc-prefetch-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._ready.notify()
+            return True
+
+    def status(self, key: Hashable) -> str | None:
+        """``queued``, ``running``, ``done``, ``failed`` albo ``None`` (nigdy nie zgłoszony)."""
+        with self._ready:
+            return self._states.get(key)
+
+    def error(self, key: Hashable) -> BaseException | None:
+        with self._ready:
+            return self._errors.get(key)
+
+    def pending(self) -> int:
+        with self._ready:
+            return len(self._jobs)
+
+    def _next(self) -> tuple[Hashable, Callable[[], object]]:
+        with self._ready:
+            while True:
+                while not self._heap:
+                    self._ready.wait()
+                priority, _, key = heapq.heappop(self._heap)
+                entry = self._jobs.get(key)
+                if entry is not None and entry[0] == priority:
+                    del self._jobs[key]
+                    self._states[key] = "running"
+                    return key, entry[1]
+
+    def _work(self) -> None:
+        while True:
+            key, job = self._next()
+            try:
+                job()
+            except Exception as exc:
+                # błąd w tle nie jest fatalny: kliknięcie w witrynę policzy ją jeszcze raz i go pokaże
+                with self._ready:
+                    self._states[key] = "failed"
+                    self._errors[key] = exc
+            else:
+                with self._ready:
+                    self._states[key] = "done"
+                    self._finished[key] = time.monotonic()
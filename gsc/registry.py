@@ -0,0 +1,64 @@
+"""Rejestr zbiorów danych witryn współdzielonych przez wszystkie sesje procesu.
+
+Każda witryna ma jeden niezmienny zbiór na wersję danych. Sesje dostają ten
+sam obiekt (widok tylko do odczytu), więc filtrowanie i agregacje muszą
+tworzyć nowe tablice, a nie modyfikować współdzielonych.
+"""
+
+from __future__ import annotations
+
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, Mapping
+
+import numpy as np
+
+from gsc.store import TimeSeriesStore
+
+
+def freeze(data: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Zbiór tylko do odczytu: kolumny NumPy bez prawa zapisu, słownik bez możliwości podmiany kluczy."""
+    stores = [value for value in data.values() if isinstance(value, TimeSeriesStore)]
+    stores += [value for nested in data.values() if isinstance(nested, Mapping)
+               for value in nested.values() if isinstance(value, TimeSeriesStore)]
+    for store in stores:
+        for column in store.columns.values():
+            if isinstance(column, np.ndarray) and column.flags.writeable:
+                column.setflags(write=False)
+    return MappingProxyType(dict(data))
+
+
+class DatasetRegistry:
+    """Jeden zbiór na (witryna, wersja); budowany raz, także gdy sesje proszą o niego równocześnie."""
+
+    def __init__(self):
+        self._datasets: dict[str, tuple[Hashable, Mapping[str, Any]]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, site: str, version: Hashable, build: Callable[[], Mapping[str, Any]]) -> Mapping[str, Any]:
+        """Zbiór witryny w danej wersji; starsza wersja jest zastępowana (sesje trzymają swoją dalej)."""
+        with self._lock:
+            entry = self._datasets.get(site)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            site_lock = self._locks.setdefault(site, threading.Lock())
+        with site_lock:
+            entry = self._datasets.get(site)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            dataset = freeze(build())
+            with self._lock:
+                self._datasets[site] = (version, dataset)
+            return dataset
+
+    def versions(self) -> dict[str, Hashable]:
+        with self._lock:
+            return {site: version for site, (version, _) in self._datasets.items()}
+
+    def discard(self, site: str | None = None) -> None:
+        with self._lock:
+            if site is None:
+                self._datasets.clear()
+            else:
+                self._datasets.pop(site, None)
@@ -0,0 +1,200 @@
+"""Raporty wsadowe bez Streamlit (cron, zadania nocne).
+
+Uruchomienie::
+
+    python -m gsc.report --site https://example.com --range 2025-07-01:2025-09-30
+
+Dla każdej pary witryna × zakres liczone są te same agregaty co w
+dashboardzie (sumy i zmiany, trend, top strony/zapytania, zwycięzcy i
+przegrani, kraje, urządzenia), w osobnych procesach. Wynik to katalog
+``<out>/<witryna>/<od>_<do>/`` z ``report.json`` i małymi plikami Parquet,
+które widok portfela wczytuje zamiast liczyć od nowa.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Hashable, Sequence
+from urllib.parse import quote
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from gsc.compare import comparison_windows
+from gsc.fetch import SearchAnalyticsFetcher, property_store, transport_from_config
+from gsc.portfolio import TOP_N, load_site, mp_context, summarize
+from gsc.store import FREQUENCIES, to_day
+from gsc.warehouse import DEFAULT_ROOT as WAREHOUSE_ROOT
+from gsc.warehouse import HISTORY_MONTHS, Warehouse
+
+DEFAULT_ROOT = Path(os.environ.get("GSC_REPORTS", ".gsc_reports"))
+SECRETS = Path(".streamlit/secrets.toml")
+
+
+def report_dir(root: str | Path, site: str, start, end) -> Path:
+    return Path(root) / quote(site, safe="") / f"{to_day(start)}_{to_day(end)}"
+
+
+def data_version(site: str, warehouse_root: str | Path | None) -> Hashable:
+    """Wersja danych, z których powstaje raport (jak w dashboardzie)."""
+    return "mock" if warehouse_root is None else Warehouse(warehouse_root).version(site)
+
+
+def build_report(site: str, start, end, warehouse_root: str | Path | None = None,
+                 top_n: int = TOP_N, aggregation: str = "month") -> dict:
+    """Podsumowanie witryny jak w portfelu plus szereg czasowy, kraje i urządzenia."""
+    data = load_site(site, warehouse_root)
+    report = summarize(data, site, start, end, top_n)
+    report["rollup"] = property_store(data).slice(start, end).rollup(aggregation)
+    for dimension, fallback in (("country", "country_data"), ("device", "device_data")):
+        window = property_store(data, dimension).slice(start, end)
+        report[fallback] = window.totals_by(dimension) if dimension in window.dimensions else data[fallback]
+    # raport z samych finalnych dni (z oknem porównawczym) pasuje do każdej późniejszej wersji danych
+    first = comparison_windows(start, end).previous[0]
+    final = warehouse_root is None or Warehouse(warehouse_root).is_final(site, first, end)
+    report.update(start=str(to_day(start)), end=str(to_day(end)), aggregation=aggregation,
+                  version=data_version(site, warehouse_root), final=final)
+    return report
+
+
+def write_report(report: dict, root: str | Path = DEFAULT_ROOT) -> Path:
+    """Zapisuje raport (ramki jako Parquet, reszta w ``report.json``); podmiana katalogu jest atomowa."""
+    target = report_dir(root, report["site"], report["start"], report["end"])
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    meta = {"generated": datetime.now(timezone.utc).isoformat(timespec="seconds"), "tables": []}
+    for name, value in report.items():
+        if isinstance(value, pd.DataFrame):
+            value.to_parquet(tmp / f"{name}.parquet", index=False)
+            meta["tables"].append(name)
+        else:
+            meta[name] = _json_value(value)
+    (tmp / "report.json").write_text(json.dumps(meta, ensure_ascii=False, indent=1))
+    old = target.with_name(f"{target.name}.{os.getpid()}.old")
+    if target.exists():
+        target.rename(old)
+    tmp.rename(target)
+    shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+def read_report(root: str | Path, site: str, start, end, version: Hashable | None = None) -> dict | None:
+    """Raport z dysku albo ``None`` (brak, albo zbudowany z innej wersji danych, która mogła zmienić jego dni)."""
+    directory = report_dir(root, site, start, end)
+    try:
+        meta = json.loads((directory / "report.json").read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if version is not None and meta.get("version") != version and not meta.get("final"):
+        return None
+    report = {name: math.nan if value is None else value for name, value in meta.items() if name != "tables"}
+    report.update((name, pd.read_parquet(directory / f"{name}.parquet")) for name in meta["tables"])
+    return report
+
+
+def run_report(site: str, start, end, warehouse_root: str | None, root: str, top_n: int, aggregation: str) -> str:
+    return str(write_report(build_report(site, start, end, warehouse_root, top_n, aggregation), root))
+
+
+def run_reports(sites: Sequence[str], ranges: Sequence[tuple[date, date]], warehouse_root: str | Path | None = None,
+                root: str | Path = DEFAULT_ROOT, max_workers: int | None = None, top_n: int = TOP_N,
+                aggregation: str = "month") -> list[tuple[str, date, date, str | BaseException]]:
+    """Wszystkie raporty równolegle (proces na raport); zwraca ścieżkę albo wyjątek dla każdego."""
+    jobs = [(site, start, end) for site in sites for start, end in ranges]
+    if not jobs:
+        return []
+    warehouse = None if warehouse_root is None else str(warehouse_root)
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context()) as pool:
+        futures = [pool.submit(run_report, site, start, end, warehouse, str(root), top_n, aggregation)
+                   for site, start, end in jobs]
+        results = []
+        for (site, start, end), future in zip(jobs, futures):
+            try:
+                results.append((site, start, end, future.result()))
+            except Exception as exc:
+                results.append((site, start, end, exc))
+        return results
+
+
+def sync_sites(sites: Sequence[str], warehouse_root: str | Path, secrets: Path, today: date) -> None:
+    """Dociąga brakujące dni z GSC (konfiguracja jak w aplikacji: sekcja ``[gsc]`` w secrets.toml)."""
+    with open(secrets, "rb") as file:
+        transport = transport_from_config(tomllib.load(file).get("gsc"))
+    if transport is None:
+        raise SystemExit(f"Brak sekcji [gsc] w {secrets}")
+    fetcher = SearchAnalyticsFetcher(transport)
+    warehouse = Warehouse(warehouse_root)
+    for site in sites:
+        changed = warehouse.sync(fetcher, site, today - relativedelta(months=HISTORY_MONTHS), today, today=today)
+        print(f"{site}: zmienione dni: {changed}", file=sys.stderr)
+
+
+def parse_range(value: str) -> tuple[date, date]:
+    try:
+        start, end = (date.fromisoformat(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Zakres w formacie RRRR-MM-DD:RRRR-MM-DD, a nie {value!r}") from None
+    if start > end:
+        raise argparse.ArgumentTypeError(f"Początek po końcu: {value!r}")
+    return start, end
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m gsc.report", description=__doc__.splitlines()[0])
+    parser.add_argument("--site", action="append", required=True, help="witryna (można powtarzać)")
+    parser.add_argument("--range", action="append", type=parse_range, default=[], dest="ranges",
+                        metavar="OD:DO", help="zakres dat (można powtarzać)")
+    parser.add_argument("--months", action="append", type=int, default=[],
+                        help="ostatnie N miesięcy do --today (można powtarzać)")
+    parser.add_argument("--today", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--aggregation", choices=FREQUENCIES, default="month")
+    parser.add_argument("--top", type=int, default=TOP_N, help="długość list top/zwycięzców/przegranych")
+    parser.add_argument("--out", type=Path, default=DEFAULT_ROOT, help="katalog raportów")
+    parser.add_argument("--warehouse", type=Path, default=WAREHOUSE_ROOT, help="hurtownia Parquet")
+    parser.add_argument("--mock", action="store_true", help="dane demonstracyjne zamiast hurtowni")
+    parser.add_argument("--sync", action="store_true", help="najpierw zsynchronizuj hurtownię z GSC")
+    parser.add_argument("--secrets", type=Path, default=SECRETS, help="plik z sekcją [gsc]")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    ranges = args.ranges + [(args.today - relativedelta(months=months), args.today) for months in args.months]
+    if not ranges:
+        parser.error("podaj --range albo --months")
+    if args.sync and not args.mock:
+        sync_sites(args.site, args.warehouse, args.secrets, args.today)
+    warehouse_root = None if args.mock else args.warehouse
+
+    failed = 0
+    for site, start, end, result in run_reports(args.site, ranges, warehouse_root, args.out, args.workers,
+                                                args.top, args.aggregation):
+        if isinstance(result, BaseException):
+            failed += 1
+            print(f"{site} {start}:{end}: błąd: {result!r}", file=sys.stderr)
+        else:
+            print(result)
+    return 1 if failed else 0
+
+
+def _json_value(value):
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Indeks trigramowy nad słownikiem wartości wymiaru (zapytania, strony).
+
+Indeksowane są unikalne wartości, nie wiersze. Każda partia nowych wartości
+to osobny segment z posortowanymi kluczami trigramów i listami identyfikatorów
+(układ CSR), budowany wektorowo w NumPy. Synchronizacja nowych dni dokleja
+tylko segment z wartościami, których jeszcze nie było.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+MODES = ("contains", "prefix", "regex")
+
+_SEPARATOR = "\x00"
+# Ucieczki, po których w wyrażeniu następuje dalsza część tej samej sekwencji
+_MULTI_ESCAPES = frozenset("xuUN")
+
+
+class _Segment(NamedTuple):
+    keys: np.ndarray     # unikalne klucze trigramów (int64), posortowane
+    offsets: np.ndarray  # granice list w ``ids``
+    ids: np.ndarray      # identyfikatory wartości (int32)
+
+    def postings(self, key: int) -> np.ndarray:
+        pos = int(np.searchsorted(self.keys, key))
+        if pos == len(self.keys) or self.keys[pos] != key:
+            return self.ids[:0]
+        return self.ids[self.offsets[pos]:self.offsets[pos + 1]]
+
+
+def trigram_keys(text: str) -> np.ndarray:
+    """Klucze trigramów tekstu: trzy punkty kodowe (po 21 bitów) w jednym int64."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    if len(codes) < 3:
+        return codes[:0]
+    return (codes[:-2] << 42) | (codes[1:-1] << 21) | codes[2:]
+
+
+def _build_segment(values: list[str], first_id: int) -> _Segment:
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    keys = trigram_keys(_SEPARATOR.join(values) + _SEPARATOR)
+    owner = np.repeat(np.arange(first_id, first_id + len(values), dtype=np.int32), lengths + 1)
+    # trigram musi leżeć w całości w jednej wartości i nie obejmować separatora
+    valid = (owner[:-2] == owner[2:]) & ((keys & 0x1FFFFF) != 0)
+    keys, ids = keys[valid], owner[:-2][valid]
+    order = np.lexsort((ids, keys))
+    keys, ids = keys[order], ids[order]
+    distinct = np.ones(len(keys), dtype=bool)
+    distinct[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+    keys, ids = keys[distinct], ids[distinct]
+    unique, starts = np.unique(keys, return_index=True)
+    return _Segment(unique, np.r_[starts, len(keys)], ids)
+
+
+def _literals(pattern: str) -> list[str]:
+    """Stałe fragmenty (min. 3 znaki), które musi zawierać każde dopasowanie wyrażenia.
+
+    Przy alternatywach i grupach zwraca pustą listę - wtedy regex sprawdza cały słownik.
+    """
+    if "|" in pattern or "(" in pattern:
+        return []
+    literals, current, i = [], [], 0
+
+    def flush():
+        literals.append("".join(current))
+        current.clear()
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            if escaped in _MULTI_ESCAPES or escaped.isdigit():
+                # \x41, \u0041, \N{...}, ósemkowe i odwołania - bez rozbioru całej sekwencji
+                # jej reszta stałaby się wymaganym fragmentem, więc regex sprawdza cały słownik
+                return []
+            if escaped.isalnum():
+                flush()
+            else:
+                current.append(escaped)
+            i += 2
+            continue
+        if char in "?*{":
+            # poprzedni znak jest opcjonalny
+            if current:
+                current.pop()
+            flush()
+            if char == "{":
+                i = pattern.find("}", i) if "}" in pattern[i:] else len(pattern) - 1
+        elif char == "[":
+            flush()
+            i = pattern.find("]", i + 2) if "]" in pattern[i + 2:] else len(pattern) - 1
+        elif char in ".^$+":
+            flush()
+        else:
+            current.append(char)
+        i += 1
+    flush()
+    return [literal for literal in literals if len(literal) >= 3]
+
+
+class SearchIndex:
+    """Indeks podciągów/prefiksów/regexów nad słownikiem wartości (bez rozróżniania wielkości liter)."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.vocabulary: list[str] = []
+        self._lower = np.empty(0, dtype=object)
+        self._ids: dict[str, int] = {}
+        self._segments: list[_Segment] = []
+        self._index: pd.Index | None = None
+        self._lock = threading.Lock()
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+    @property
+    def nbytes(self) -> int:
+        """Segmenty indeksu i słownik wartości."""
+        segments = sum(array.nbytes for segment in self._segments for array in segment)
+        return segments + int(pd.Index(self.vocabulary, dtype=object).memory_usage(deep=True))
+
+    def extend(self, values: Iterable[str]) -> int:
+        """Dodaje nieznane wartości jako nowy segment; zwraca ich liczbę."""
+        with self._lock:
+            new = [value for value in dict.fromkeys(map(str, values)) if value not in self._ids]
+            if not new:
+                return 0
+            first = len(self.vocabulary)
+            self._ids.update((value, first + offset) for offset, value in enumerate(new))
+            self.vocabulary.extend(new)
+            lower = [value.lower() for value in new]
+            self._lower = np.concatenate([self._lower, np.array(lower, dtype=object)])
+            self._segments.append(_build_segment(lower, first))
+            self._index = None
+            return len(new)
+
+    def codes(self, values) -> np.ndarray:
+        """Identyfikatory wartości w słowniku (-1 dla nieznanych)."""
+        if self._index is None:
+            self._index = pd.Index(self.vocabulary)
+        return self._index.get_indexer(pd.Index(np.asarray(values, dtype=object)))
+
+    def search(self, pattern: str, mode: str = "contains") -> np.ndarray:
+        """Posortowane identyfikatory wartości pasujących do wzorca."""
+        if mode not in MODES:
+            raise ValueError(f"Nieznany tryb wyszukiwania: {mode!r}")
+        if not pattern:
+            return np.arange(len(self.vocabulary))
+        if mode == "regex":
+            regex = re.compile(pattern, re.IGNORECASE)
+            literals = [literal.lower() for literal in _literals(pattern)]
+            candidates = self._candidates(literals) if literals else np.arange(len(self._lower))
+            return candidates[[regex.search(self.vocabulary[i]) is not None for i in candidates]] \
+                if len(candidates) else candidates
+        needle = pattern.lower()
+        candidates = self._candidates([needle]) if len(needle) >= 3 else np.arange(len(self._lower))
+        if not len(candidates):
+            return candidates
+        found = pd.Series(self._lower[candidates])
+        matches = found.str.startswith(needle) if mode == "prefix" else found.str.contains(needle, regex=False)
+        return candidates[matches.to_numpy(dtype=bool)]
+
+    def mask(self, pattern: str, mode: str = "contains") -> np.ndarray:
+        """Maska logiczna nad słownikiem."""
+        mask = np.zeros(len(self.vocabulary), dtype=bool)
+        mask[self.search(pattern, mode)] = True
+        return mask
+
+    def match(self, values, pattern: str, mode: str = "contains") -> np.ndarray:
+        """Maska nad dowolnymi wartościami (np. etykietami tabeli albo wierszami)."""
+        codes = self.codes(values)
+        return np.r_[self.mask(pattern, mode), False][codes]
+
+    def _candidates(self, literals: list[str]) -> np.ndarray:
+        """Identyfikatory zawierające wszystkie trigramy wszystkich fragmentów."""
+        keys = np.unique(np.concatenate([trigram_keys(literal) for literal in literals]))
+        result = []
+        for segment in self._segments:
+            postings = sorted((segment.postings(key) for key in keys), key=len)
+            found = postings[0]
+            for posting in postings[1:]:
+                if not len(found):
+                    break
+                found = np.intersect1d(found, posting, assume_unique=True)
+            result.append(found)
+        return np.concatenate(result).astype(np.intp) if result else np.empty(0, dtype=np.intp)
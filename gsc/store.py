@@ -0,0 +1,199 @@
+"""Kolumnowy magazyn szeregu czasowego GSC.
+
+Metryki mają wąskie typy (int32 dla kliknięć i wyświetleń, float32 dla CTR
+i pozycji), a wymiary są kodowane słownikowo: kody wierszy plus jedna lista
+etykiet z internowanymi ciągami, wspólnymi dla wszystkich wycinków i zbiorów.
+Sumy liczone są zawsze w int64/float64.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+METRICS = ("clicks", "impressions", "ctr", "position")
+FREQUENCIES = ("day", "week", "month")
+
+_DTYPES = {
+    "date": "datetime64[D]",
+    "clicks": np.int32,
+    "impressions": np.int32,
+    "ctr": np.float32,
+    "position": np.float32,
+}
+
+
+def to_day(value) -> np.datetime64:
+    """Zamienia str/date/datetime64 na datetime64[D]."""
+    return np.datetime64(value, "D")
+
+
+def period_start(dates: np.ndarray, freq: str) -> np.ndarray:
+    """Początek okresu (dzień, tydzień od poniedziałku, miesiąc) dla każdej daty."""
+    days = dates.astype("datetime64[D]")
+    if freq == "day":
+        return days
+    if freq == "week":
+        # 1970-01-01 to czwartek, więc +3 daje 0 dla poniedziałku
+        offset = (days.astype(np.int64) + 3) % 7
+        return days - offset.astype("timedelta64[D]")
+    if freq == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"Nieznana agregacja: {freq!r}")
+
+
+def weighted(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Dzieli sumy ważone przez wagi; przy zerowej wadze zwraca NaN."""
+    out = np.full(np.shape(values), np.nan)
+    np.divide(values, weights, out=out, where=weights > 0)
+    return out
+
+
+def dictionary(values) -> pd.Categorical:
+    """Kolumna wymiaru zakodowana słownikowo; etykiety są internowane (jeden obiekt na ciąg w procesie)."""
+    if isinstance(values, pd.Series):
+        values = values.array
+    if isinstance(values, pd.Categorical):
+        codes, labels = values.codes, values.categories
+    else:
+        codes, labels = pd.factorize(np.asarray(values, dtype=object))
+    labels = pd.Index([sys.intern(str(label)) for label in labels], dtype=object)
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
+def factorize(column) -> tuple[np.ndarray, np.ndarray]:
+    """Kody i etykiety (tylko występujące) kolumny wymiaru; dla kolumn słownikowych bez haszowania."""
+    if not isinstance(column, pd.Categorical):
+        codes, labels = pd.factorize(column)
+        return codes, np.asarray(labels, dtype=object)
+    labels = np.asarray(column.categories, dtype=object)
+    used = np.bincount(column.codes, minlength=len(labels)) > 0
+    if used.all():
+        return column.codes, labels
+    remap = (np.cumsum(used) - 1).astype(column.codes.dtype)
+    return remap[column.codes], labels[used]
+
+
+def nbytes(column) -> int:
+    """Rozmiar kolumny w bajtach (dla kolumn słownikowych: kody i etykiety)."""
+    if isinstance(column, pd.Categorical):
+        return column.codes.nbytes + int(column.categories.memory_usage(deep=True))
+    return column.nbytes
+
+
+class TimeSeriesStore:
+    """Szereg czasowy trzymany w kolumnach NumPy, posortowany po dacie.
+
+    Poza datą i metrykami może mieć kolumny wymiarów (np. ``page``, ``query``).
+    Wycinki zakresu dat to widoki (``searchsorted`` + slice), bez kopiowania.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Mapping[str, Iterable], *, presorted: bool = False):
+        cols = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in _DTYPES.items()}
+        cols.update((name, dictionary(col)) for name, col in columns.items() if name not in _DTYPES)
+        lengths = {len(col) for col in cols.values()}
+        if len(lengths) > 1:
+            raise ValueError("Kolumny mają różne długości")
+        dates = cols["date"]
+        if not presorted and len(dates) > 1 and (dates[1:] < dates[:-1]).any():
+            order = np.argsort(dates, kind="stable")
+            cols = {name: col[order] for name, col in cols.items()}
+        self.columns = cols
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> "TimeSeriesStore":
+        return cls.from_frame(pd.DataFrame.from_records(list(records)))
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "TimeSeriesStore":
+        return cls({name: frame[name].array for name in frame.columns})
+
+    def __len__(self) -> int:
+        return len(self.columns["date"])
+
+    @property
+    def dimensions(self) -> tuple[str, ...]:
+        return tuple(name for name in self.columns if name not in _DTYPES)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(nbytes(col) for col in self.columns.values())
+
+    def memory_usage(self) -> pd.Series:
+        """Bajty per kolumna."""
+        return pd.Series({name: nbytes(col) for name, col in self.columns.items()}, dtype=np.int64)
+
+    @property
+    def date(self) -> np.ndarray:
+        return self.columns["date"]
+
+    @property
+    def clicks(self) -> np.ndarray:
+        return self.columns["clicks"]
+
+    @property
+    def impressions(self) -> np.ndarray:
+        return self.columns["impressions"]
+
+    @property
+    def ctr(self) -> np.ndarray:
+        return self.columns["ctr"]
+
+    @property
+    def position(self) -> np.ndarray:
+        return self.columns["position"]
+
+    def bounds(self, start, end) -> tuple[int, int]:
+        """Indeksy wierszy [lo, hi) dla zakresu dat włącznie z końcami."""
+        lo = int(np.searchsorted(self.date, to_day(start), side="left"))
+        hi = int(np.searchsorted(self.date, to_day(end), side="right"))
+        return lo, max(lo, hi)
+
+    def slice(self, start, end) -> "TimeSeriesStore":
+        lo, hi = self.bounds(start, end)
+        view = object.__new__(TimeSeriesStore)
+        view.columns = {name: col[lo:hi] for name, col in self.columns.items()}
+        return view
+
+    def take(self, rows: np.ndarray) -> "TimeSeriesStore":
+        """Podzbiór wierszy (maska albo indeksy) - kopia z zachowaniem kolejności dat."""
+        view = object.__new__(TimeSeriesStore)
+        view.columns = {name: col[rows] for name, col in self.columns.items()}
+        return view
+
+    def rollup(self, freq: str = "day") -> pd.DataFrame:
+        """Sumy per dzień/tydzień/miesiąc; CTR i pozycja ważone wyświetleniami."""
+        keys = period_start(self.date, freq)
+        if not len(keys):
+            return pd.DataFrame({"date": keys, **{m: np.empty(0) for m in METRICS}})
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        impressions = np.add.reduceat(self.impressions, starts, dtype=np.int64)
+        return pd.DataFrame({
+            "date": keys[starts],
+            "clicks": np.add.reduceat(self.clicks, starts, dtype=np.int64),
+            "impressions": impressions,
+            "ctr": weighted(np.add.reduceat(self.ctr * self.impressions, starts), impressions),
+            "position": weighted(np.add.reduceat(self.position * self.impressions, starts), impressions),
+        })
+
+    def totals_by(self, dimension: str, sort: bool = True) -> pd.DataFrame:
+        """Sumy per wartość wymiaru (przy ``sort`` malejąco po kliknięciach)."""
+        codes, labels = factorize(self.columns[dimension])
+        impressions = np.bincount(codes, weights=self.impressions, minlength=len(labels))
+        frame = pd.DataFrame({
+            dimension: labels,
+            "clicks": np.bincount(codes, weights=self.clicks, minlength=len(labels)).astype(np.int64),
+            "impressions": impressions.astype(np.int64),
+            "ctr": weighted(np.bincount(codes, weights=self.clicks, minlength=len(labels)) * 100.0, impressions),
+            "position": weighted(np.bincount(codes, weights=self.position * self.impressions,
+                                             minlength=len(labels)), impressions),
+        })
+        return frame.sort_values("clicks", ascending=False, ignore_index=True) if sort else frame
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
@@ -0,0 +1,102 @@
+"""Powtarzalny generator syntetycznych danych GSC w realnej skali.
+
+Wiersze to komórki dzień × strona × zapytanie × kraj × urządzenie, jak w
+tabeli ``cube``. Popularność stron i zapytań ma długi ogon (rozkład Zipfa),
+kraje i urządzenia mają stałe udziały, ruch ma trend i rytm tygodniowy.
+CTR wynika z pozycji (krzywa CTR), a kliknięcia są losowane dwumianowo
+z wyświetleń, więc metryki są ze sobą spójne.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from gsc.fetch import site_data
+from gsc.store import TimeSeriesStore
+
+START_DATE = np.datetime64("2024-06-01")
+END_DATE = np.datetime64("2025-09-30")
+# Liczba wierszy danych demonstracyjnych; 0 = statyczne dane z ``gsc.mock``
+DEMO_ROWS = int(os.environ.get("GSC_DEMO_ROWS", "0"))
+
+COUNTRIES = {"pol": 0.72, "usa": 0.07, "deu": 0.06, "gbr": 0.05, "fra": 0.03, "ukr": 0.03, "cze": 0.02, "nld": 0.02}
+DEVICES = {"MOBILE": 0.58, "DESKTOP": 0.38, "TABLET": 0.04}
+SECTIONS = ("blog", "poradnik", "produkty", "kategoria", "narzedzia", "o-nas")
+WORDS = ("seo", "pozycjonowanie", "google", "strona", "sklep", "ranking", "fraza", "linki", "audyt", "content",
+         "analiza", "ruch", "konwersja", "cena", "jak", "najlepszy", "darmowy", "2025", "poradnik", "narzędzie")
+
+
+def zipf_weights(size: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def page_labels(size: int, rng: np.random.Generator) -> np.ndarray:
+    sections = np.asarray(SECTIONS, dtype=object)[rng.integers(0, len(SECTIONS), size)]
+    return np.array([f"/{section}/artykul-{i}" for i, section in enumerate(sections)], dtype=object)
+
+
+def query_labels(size: int, rng: np.random.Generator) -> np.ndarray:
+    words = np.asarray(WORDS, dtype=object)
+    lengths = rng.integers(1, 5, size)
+    picks = np.argsort(rng.random((size, len(words))), axis=1)[:, :4]
+    # numer na końcu gwarantuje unikalność także przy powtórzonym układzie słów
+    return np.array([" ".join(words[picks[i, :lengths[i]]]) + f" {i}" for i in range(size)], dtype=object)
+
+
+def generate(rows: int, start=START_DATE, end=END_DATE, pages: int | None = None, queries: int | None = None,
+             seed: int = 0) -> TimeSeriesStore:
+    """Zbiór o ``rows`` wierszach; te same argumenty zawsze dają te same dane."""
+    rng = np.random.default_rng(seed)
+    pages = pages or max(10, rows // 200)
+    queries = queries or max(10, rows // 40)
+
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    progress = np.linspace(0.0, 1.0, len(days))
+    weekday = (days.astype(np.int64) + 3) % 7
+    day_weights = (1.0 + progress) * np.where(weekday >= 5, 0.7, 1.0)
+    date = days[np.sort(rng.choice(len(days), rows, p=day_weights / day_weights.sum()))]
+
+    page = rng.choice(pages, rows, p=zipf_weights(pages))
+    query = rng.choice(queries, rows, p=zipf_weights(queries))
+    country = rng.choice(len(COUNTRIES), rows, p=list(COUNTRIES.values()))
+    device = rng.choice(len(DEVICES), rows, p=list(DEVICES.values()))
+
+    # popularne strony/zapytania mają więcej wyświetleń i lepsze pozycje
+    popularity = 1.0 / np.sqrt(1.0 + page) + 1.0 / np.sqrt(1.0 + query)
+    impressions = np.maximum(1, rng.lognormal(0.5 + 2.0 * popularity, 1.2, rows)).astype(np.int64)
+    position = np.clip(rng.gamma(2.0, 9.0 / (1.0 + 2.0 * popularity), rows) + 1.0, 1.0, 100.0)
+    expected_ctr = 0.3 / position ** 1.2 * np.where(device == 0, 0.9, 1.0)
+    clicks = rng.binomial(impressions, expected_ctr)
+
+    return TimeSeriesStore({
+        "date": date,
+        "clicks": clicks,
+        "impressions": impressions,
+        "ctr": clicks * 100.0 / impressions,
+        "position": position,
+        "page": pd.Categorical.from_codes(page, categories=page_labels(pages, rng)),
+        "query": pd.Categorical.from_codes(query, categories=query_labels(queries, rng)),
+        "country": pd.Categorical.from_codes(country, categories=list(COUNTRIES)),
+        "device": pd.Categorical.from_codes(device, categories=list(DEVICES)),
+    }, presorted=True)
+
+
+def synthetic_data(rows: int, seed: int = 0, **kwargs) -> dict:
+    """Dane witryny w układzie ``gsc.fetch.site_data`` (jak z hurtowni)."""
+    return site_data({"cube": generate(rows, seed=seed, **kwargs)})
+
+
+def api_rows(store: TimeSeriesStore, dimensions=("date", "page", "query", "country", "device")) -> list[dict]:
+    """Wiersze w formacie odpowiedzi searchanalytics.query (do testów parsowania)."""
+    keys = [store.date.astype(str).tolist() if name == "date" else np.asarray(store.columns[name], dtype=object)
+            for name in dimensions]
+    return [
+        {"keys": list(key), "clicks": int(clicks), "impressions": int(impressions),
+         "ctr": float(ctr) / 100.0, "position": float(position)}
+        for key, clicks, impressions, ctr, position in zip(
+            zip(*keys), store.clicks, store.impressions, store.ctr, store.position)
+    ]
@@ -0,0 +1,50 @@
+"""Top-K i stronicowanie tabel po stronie serwera.
+
+Zamiast sortować setki tysięcy wierszy, ``argpartition`` wybiera k
+najlepszych w O(n), a sortowane jest tylko tych k. Do przeglądarki trafia
+wyłącznie widoczna strona tabeli.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def top_k_indices(values: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+    """Indeksy k najlepszych wartości w kolejności; NaN zawsze na końcu.
+
+    Remisy rozstrzyga numer wiersza (jak sortowanie stabilne), więc kolejne
+    strony tabeli - liczone z różnym k - nie gubią ani nie powtarzają wierszy.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keys = -values if descending else values.copy()
+    keys[np.isnan(keys)] = np.inf
+    k = max(0, min(k, len(keys)))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(keys):
+        # argpartition wybiera spośród równych k-tej wartości dowolne - bierzemy pierwsze
+        threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+        below = np.flatnonzero(keys < threshold)
+        best = np.concatenate([below, np.flatnonzero(keys == threshold)[:k - len(below)]])
+    else:
+        best = np.arange(len(keys))
+    return best[np.lexsort((best, keys[best]))]
+
+
+def top_k(frame: pd.DataFrame, column: str, k: int, descending: bool = True,
+          mask: np.ndarray | None = None) -> pd.DataFrame:
+    """k najlepszych wierszy ramki według kolumny (opcjonalnie tylko spośród ``mask``)."""
+    rows = np.arange(len(frame)) if mask is None else np.flatnonzero(mask)
+    best = top_k_indices(frame[column].to_numpy()[rows], k, descending)
+    return frame.iloc[rows[best]]
+
+
+def page_rows(frame: pd.DataFrame, sort_by: str, descending: bool = True, page: int = 0,
+              page_size: int = 50, mask: np.ndarray | None = None) -> tuple[pd.DataFrame, int]:
+    """Jedna strona tabeli posortowanej po ``sort_by`` oraz liczba wszystkich pasujących wierszy."""
+    total = len(frame) if mask is None else int(np.count_nonzero(mask))
+    start = max(0, page) * page_size
+    best = top_k(frame, sort_by, start + page_size, descending, mask)
+    return best.iloc[start:start + page_size], total
@@ -0,0 +1,61 @@
+"""Indeks sum prefiksowych: sumy dowolnego zakresu dat w O(1)."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from gsc.store import TimeSeriesStore, to_day, weighted
+
+
+class PeriodTotals(NamedTuple):
+    clicks: int
+    impressions: int
+    ctr: float
+    position: float
+
+
+class PrefixSumIndex:
+    """Skumulowane sumy kliknięć, wyświetleń i pozycji ważonej wyświetleniami.
+
+    Sumy są próbkowane na końcu każdego dnia, więc indeks ma rozmiar liczby
+    dni, a nie wierszy strona×dzień. Zakres dat to dwa odczyty z tablic.
+    """
+
+    __slots__ = ("days", "clicks", "impressions", "weighted_position")
+
+    def __init__(self, store: TimeSeriesStore):
+        dates = store.date
+        ends = np.flatnonzero(np.r_[dates[1:] != dates[:-1], True]) if len(dates) else np.empty(0, int)
+        self.days = dates[ends]
+        self.clicks = _cumulative(store.clicks, ends)
+        self.impressions = _cumulative(store.impressions, ends)
+        self.weighted_position = _cumulative(store.position * store.impressions, ends)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def totals(self, start=None, end=None) -> PeriodTotals:
+        """Sumy dla zakresu [start, end] (brak granicy = cały zbiór)."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, to_day(start), side="left"))
+        hi = len(self.days) if end is None else int(np.searchsorted(self.days, to_day(end), side="right"))
+        hi = max(lo, hi)
+        clicks = int(self.clicks[hi] - self.clicks[lo])
+        impressions = int(self.impressions[hi] - self.impressions[lo])
+        position = self.weighted_position[hi] - self.weighted_position[lo]
+        return PeriodTotals(
+            clicks=clicks,
+            impressions=impressions,
+            ctr=float(weighted(clicks * 100.0, impressions)),
+            position=float(weighted(position, impressions)),
+        )
+
+
+def _cumulative(values: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Sumy skumulowane z zerem na początku, odczytane na końcach dni."""
+    return np.r_[0, np.cumsum(values)[ends]]
@@ -0,0 +1,291 @@
+"""Lokalna hurtownia Parquet z synchronizacją tylko brakujących dni.
+
+Układ na dysku: ``<root>/<witryna>/<tabela>/<RRRR-MM>.parquet`` plus
+``manifest.json`` w katalogu tabeli z mapą ``dzień -> final|fresh``.
+Dni starsze niż retencja GSC (16 miesięcy) zostają na dysku. Niefinalne dni
+są pobierane ponownie najwyżej co ``REFRESH_SECONDS`` (czas ostatniego
+pobrania w ``refreshed.json``), a pliki i manifest są przepisywane tylko,
+gdy dane albo stan dni się zmieniły - od tego zależy wersja danych.
+
+Do odczytu przez aplikację tabela jest też zrzucana do nieskompresowanego
+pliku Arrow IPC (``<witryna>/<tabela>.arrow``), mapowanego w pamięć bez
+kopiowania - wszystkie sesje i procesy korzystają z tych samych stron pamięci.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from gsc.fetch import FRESH_DAYS, TABLES, SearchAnalyticsFetcher
+from gsc.perf import stage
+from gsc.store import TimeSeriesStore, to_day
+
+DEFAULT_ROOT = Path(os.environ.get("GSC_WAREHOUSE", ".gsc_warehouse"))
+# Jak często (s) pobierać ponownie niefinalne dni
+REFRESH_SECONDS = int(os.environ.get("GSC_REFRESH_MINUTES", "60")) * 60
+# Zakres synchronizacji (pełna retencja GSC)
+HISTORY_MONTHS = 16
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+def day_ranges(days: np.ndarray) -> Iterator[tuple[np.datetime64, np.datetime64]]:
+    """Skleja posortowane dni w ciągłe przedziały [od, do]."""
+    if not len(days):
+        return
+    breaks = np.flatnonzero(np.diff(days) != _ONE_DAY)
+    starts = np.r_[0, breaks + 1]
+    ends = np.r_[breaks, len(days) - 1]
+    yield from zip(days[starts], days[ends])
+
+
+class Warehouse:
+    """Partycjonowany po witrynie i miesiącu magazyn tabel z ``gsc.fetch.TABLES``."""
+
+    def __init__(self, root: str | Path = DEFAULT_ROOT):
+        self.root = Path(root)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def lock(self, site_url: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(site_url, threading.Lock())
+
+    def table_dir(self, site_url: str, table: str) -> Path:
+        return self.root / quote(site_url, safe="") / table
+
+    def manifest(self, site_url: str, table: str) -> dict[str, str]:
+        path = self.table_dir(site_url, table) / "manifest.json"
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def refreshed(self, site_url: str, table: str) -> dict[str, float]:
+        """Czas (epoka, s) ostatniego pobrania każdego niefinalnego dnia."""
+        path = self.table_dir(site_url, table) / "refreshed.json"
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def version(self, site_url: str) -> int:
+        """Zmienia się przy każdej zapisanej synchronizacji (najnowszy mtime manifestów)."""
+        manifests = self.root.joinpath(quote(site_url, safe="")).glob("*/manifest.json")
+        return max((path.stat().st_mtime_ns for path in manifests), default=0)
+
+    def is_final(self, site_url: str, start, end) -> bool:
+        """Czy dane zakresu już się nie zmienią: każdy dzień wszystkich tabel jest finalny.
+
+        Dni sprzed pierwszego zsynchronizowanego (poza retencją GSC) też się nie zmienią.
+        """
+        days = np.arange(to_day(start), to_day(end) + _ONE_DAY).astype(str)
+        for table in TABLES:
+            manifest = self.manifest(site_url, table)
+            if not manifest:
+                return False
+            first = min(manifest)
+            if any(manifest.get(day) != "final" for day in days if day >= first):
+                return False
+        return True
+
+    def missing_days(self, site_url: str, table: str, start, end, today=None, now: float | None = None) -> np.ndarray:
+        """Dni z zakresu do pobrania: nieobecne na dysku i niefinalne.
+
+        Niefinalny dzień z ostatnich ``FRESH_DAYS`` pobrany mniej niż
+        ``REFRESH_SECONDS`` temu jest pomijany; starszy jest pobierany, żeby
+        stał się finalny.
+        """
+        days = np.arange(to_day(start), to_day(end) + _ONE_DAY)
+        fresh_from = str(_fresh_from(today))
+        now = time.time() if now is None else now
+        manifest = self.manifest(site_url, table)
+        refreshed = self.refreshed(site_url, table)
+        current = np.array([day for day, state in manifest.items() if state == "final" or (
+            day >= fresh_from and now - refreshed.get(day, 0.0) < REFRESH_SECONDS)], dtype="datetime64[D]")
+        return days[~np.isin(days, current)]
+
+    def read(self, site_url: str, table: str, start=None, end=None) -> TimeSeriesStore:
+        """Wczytuje tabelę (opcjonalnie tylko miesiące z zakresu) przez mapowanie pamięci."""
+        directory = self.table_dir(site_url, table)
+        first = None if start is None else str(to_day(start).astype("datetime64[M]"))
+        last = None if end is None else str(to_day(end).astype("datetime64[M]"))
+        paths = sorted(
+            path for path in directory.glob("*.parquet")
+            if (first is None or path.stem >= first) and (last is None or path.stem <= last)
+        )
+        dimensions = TABLES[table][0]
+        if not paths:
+            return TimeSeriesStore({name: [] for name in (*dimensions, "clicks", "impressions", "ctr", "position")})
+        # wymiary zawsze jako słowniki (int32), starsze pliki z int64/float64 są ujednolicane
+        dictionary = [name for name in dimensions if name != "date"]
+        arrow = pa.concat_tables((pq.read_table(path, memory_map=True, read_dictionary=dictionary) for path in paths),
+                                 promote_options="permissive")
+        store = TimeSeriesStore.from_frame(arrow.to_pandas(date_as_object=False))
+        if start is None and end is None:
+            return store
+        return store.slice(store.date[0] if start is None else start, store.date[-1] if end is None else end)
+
+    def read_all(self, site_url: str) -> dict[str, TimeSeriesStore]:
+        return {table: self.read(site_url, table) for table in TABLES}
+
+    def snapshot(self, site_url: str, table: str) -> TimeSeriesStore:
+        """Tabela jako tylko-do-odczytu widok na zmapowany plik Arrow (odtwarzany po synchronizacji)."""
+        path = self.root / quote(site_url, safe="") / f"{table}.arrow"
+        manifest = self.table_dir(site_url, table) / "manifest.json"
+        with self.lock(site_url), stage("snapshot"):
+            if not path.exists() or (manifest.exists() and path.stat().st_mtime_ns < manifest.stat().st_mtime_ns):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                arrow = _to_arrow(self.read(site_url, table))
+                _atomic_write(path, lambda tmp: _write_ipc(tmp, arrow))
+        return _from_arrow(ipc.open_file(pa.memory_map(str(path))).read_all())
+
+    def snapshot_all(self, site_url: str) -> dict[str, TimeSeriesStore]:
+        return {table: self.snapshot(site_url, table) for table in TABLES}
+
+    def write_days(self, site_url: str, table: str, store: TimeSeriesStore, days: np.ndarray, state: str) -> int:
+        """Podmienia wskazane dni (także puste) w partycjach miesięcznych i oznacza je w manifeście.
+
+        Zwraca liczbę dni, których wiersze albo stan się zmieniły; bez zmian
+        nic nie jest zapisywane, więc wersja danych zostaje ta sama.
+        """
+        if not len(days):
+            return 0
+        directory = self.table_dir(site_url, table)
+        directory.mkdir(parents=True, exist_ok=True)
+        frame = store.to_frame()
+        frame_months = store.date.astype("datetime64[M]")
+        months = days.astype("datetime64[M]")
+        manifest = self.manifest(site_url, table)
+        changed = {str(day) for day in days if manifest.get(str(day)) != state}
+        for month in np.unique(months):
+            path = directory / f"{month}.parquet"
+            part = frame[frame_months == month]
+            part = part[np.isin(part["date"].to_numpy(), days)]
+            kept = None
+            month_days = days[months == month]
+            if path.exists():
+                old = pq.read_table(path).to_pandas(date_as_object=False)
+                old_days = old["date"].to_numpy().astype("datetime64[D]")
+                replaced = np.isin(old_days, days)
+                if _same_rows(old[replaced], part):
+                    continue
+                kept = old[~replaced]
+                # partycja i tak jest przepisywana, ale liczą się tylko dni z innymi wierszami
+                new_days = part["date"].to_numpy().astype("datetime64[D]")
+                changed.update(str(day) for day in month_days
+                               if not _same_rows(old[old_days == day], part[new_days == day]))
+            elif not len(part):
+                continue
+            else:
+                changed.update(str(day) for day in month_days)
+            if kept is not None:
+                part = pd.concat([kept, part], ignore_index=True)
+            part = part.sort_values("date", kind="stable", ignore_index=True)
+            _atomic_write(path, lambda tmp: pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp))
+        if changed:
+            # manifest zapisywany także przy samej zmianie wierszy - jego mtime to wersja danych
+            manifest.update((str(day), state) for day in days)
+            _atomic_write(directory / "manifest.json",
+                          lambda tmp: Path(tmp).write_text(json.dumps(manifest, sort_keys=True)))
+        return len(changed)
+
+    def mark_refreshed(self, site_url: str, table: str, days: np.ndarray, now: float | None = None) -> None:
+        """Zapisuje czas pobrania niefinalnych dni (dni finalne są usuwane z pliku)."""
+        now = time.time() if now is None else now
+        refreshed = self.refreshed(site_url, table)
+        manifest = self.manifest(site_url, table)
+        refreshed = {day: at for day, at in refreshed.items() if manifest.get(day) == "fresh"}
+        refreshed.update((str(day), now) for day in days)
+        _atomic_write(self.table_dir(site_url, table) / "refreshed.json",
+                      lambda tmp: Path(tmp).write_text(json.dumps(refreshed, sort_keys=True)))
+
+    def sync(self, fetcher: SearchAnalyticsFetcher, site_url: str, start, end, today=None,
+             now: float | None = None) -> int:
+        """Dociąga brakujące dni i niefinalne dni do odświeżenia; zwraca liczbę dni, które się zmieniły.
+
+        Zero oznacza, że wersja danych (``version``) została ta sama.
+        """
+        fresh_from = _fresh_from(today)
+        fetched = changed = 0
+        with self.lock(site_url), stage("sync") as record:
+            for table, (dimensions, chunk_days) in TABLES.items():
+                for first, last in day_ranges(self.missing_days(site_url, table, start, end, today, now)):
+                    store = fetcher.fetch(site_url, first, last, dimensions, chunk_days=chunk_days, data_state="all")
+                    days = np.arange(first, last + _ONE_DAY)
+                    fresh = days >= fresh_from
+                    changed += self.write_days(site_url, table, store, days[~fresh], "final")
+                    changed += self.write_days(site_url, table, store, days[fresh], "fresh")
+                    if fresh.any():
+                        self.mark_refreshed(site_url, table, days[fresh], now)
+                    fetched += len(days)
+            record.rows = fetched
+        return changed
+
+
+def _fresh_from(today=None) -> np.datetime64:
+    """Pierwszy dzień, który GSC może jeszcze zmienić."""
+    return to_day(today if today is not None else np.datetime64("today")) - np.timedelta64(FRESH_DAYS, "D")
+
+
+def _same_rows(old: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """Te same wiersze niezależnie od kolejności (GSC jej nie gwarantuje) i typu kolumny daty."""
+    if len(old) != len(new):
+        return False
+    if not len(new):
+        return True
+    return _canonical(old[list(new.columns)]).equals(_canonical(new))
+
+
+def _canonical(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.assign(date=frame["date"].to_numpy().astype("datetime64[D]"))
+    # wymiary bywają kategoriami, ``str`` albo ``object`` - zależnie od źródła i wersji pandas
+    frame = frame.astype({name: object for name, dtype in frame.dtypes.items()
+                          if name != "date" and not pd.api.types.is_numeric_dtype(dtype)})
+    return frame.sort_values(list(frame.columns), ignore_index=True)
+
+
+def _to_arrow(store: TimeSeriesStore) -> pa.Table:
+    """Kolumny 1:1 z buforami NumPy: data jako int64 dni, wymiary jako słowniki z kodami pandas."""
+    arrays = {}
+    for name, column in store.columns.items():
+        if name == "date":
+            arrays[name] = pa.array(column.astype(np.int64))
+        elif isinstance(column, pd.Categorical):
+            labels = pa.array(np.asarray(column.categories, dtype=object), type=pa.string())
+            arrays[name] = pa.DictionaryArray.from_arrays(pa.array(column.codes), labels)
+        else:
+            arrays[name] = pa.array(column)
+    return pa.table(arrays)
+
+
+def _write_ipc(path: Path, table: pa.Table) -> None:
+    with pa.OSFile(str(path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _from_arrow(table: pa.Table) -> TimeSeriesStore:
+    """Odwrotność ``_to_arrow`` bez kopiowania buforów (poza etykietami wymiarów)."""
+    columns = {}
+    for name in table.column_names:
+        array = table[name].combine_chunks()
+        if pa.types.is_dictionary(array.type):
+            labels = pd.Index(array.dictionary.to_pylist(), dtype=object)
+            columns[name] = pd.Categorical.from_codes(array.indices.to_numpy(zero_copy_only=True), categories=labels)
+        elif name == "date":
+            columns[name] = array.to_numpy(zero_copy_only=True).view("datetime64[D]")
+        else:
+            columns[name] = array.to_numpy(zero_copy_only=True)
+    return TimeSeriesStore(columns, presorted=True)
+
+
+def _atomic_write(path: Path, write) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
@@ -0,0 +1,79 @@
+"""Pamięć podręczna wyników (gsc.cache): LRU z budżetem bajtów, TTL i unieważnianie po wersji danych."""
+
+import numpy as np
+
+from gsc.cache import FINAL_TTL, FRESH_TTL, ResultCache, cache_key, ttl_for
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def block(kb: int) -> np.ndarray:
+    return np.zeros(kb * 1024, dtype=np.uint8)
+
+
+def test_hit_returns_stored_value_without_computing():
+    cache, calls = ResultCache(), []
+    key = cache_key("site", 1, "totals", start="2025-09-01")
+    first = cache.get_or_compute(key, lambda: calls.append(1) or block(1))
+    assert cache.get_or_compute(key, lambda: calls.append(1) or block(1)) is first
+    assert calls == [1]
+    assert cache.stats()[:2] == (1, 1)
+
+
+def test_least_recently_used_is_evicted_over_budget():
+    cache = ResultCache(max_bytes=3 * 1024)
+    blocks = {name: block(1) for name in "abcd"}
+    for name in "abc":
+        cache.put((name,), blocks[name])
+    cache.get_or_compute(("a",), lambda: None)
+    cache.put(("d",), blocks["d"])
+    assert cache.stats().evictions == 1 and cache.stats().bytes == 3 * 1024
+    for name in "acd":
+        assert cache.get_or_compute((name,), lambda: None) is blocks[name]
+    assert cache.get_or_compute(("b",), lambda: None) is None
+
+
+def test_value_over_budget_is_not_stored():
+    cache = ResultCache(max_bytes=1024)
+    cache.put(("small",), block(1))
+    cache.put(("big",), block(2))
+    assert cache.stats().entries == 1
+    assert cache.get_or_compute(("big",), lambda: "computed") == "computed"
+
+
+def test_entry_expires_after_ttl():
+    clock, value = Clock(), block(1)
+    cache = ResultCache(clock=clock)
+    cache.put(("k",), value, ttl=10)
+    clock.now = 9.9
+    assert cache.get_or_compute(("k",), lambda: None) is value
+    clock.now = 10.0
+    assert cache.get_or_compute(("k",), lambda: None) is None
+
+
+def test_invalidate_keeps_current_version_and_other_sites():
+    cache = ResultCache()
+    for site, version in (("a", 1), ("a", 2), ("b", 1)):
+        cache.put(cache_key(site, version, "totals"), block(1))
+    assert cache.invalidate("a", keep_version=2) == 1
+    assert cache.stats().entries == 2
+    assert cache.invalidate("a") == 1
+    assert cache.invalidate() == 1
+    assert cache.stats().bytes == 0
+
+
+def test_cache_key_ignores_parameter_and_list_order():
+    assert cache_key("s", 1, "top", filters=["b", "a"], n=10) == cache_key("s", 1, "top", n=10, filters=["a", "b"])
+    assert cache_key("s", 1, "top", n=10) != cache_key("s", 2, "top", n=10)
+
+
+def test_ttl_is_short_only_for_ranges_reaching_fresh_days():
+    assert ttl_for("2025-09-30", today="2025-09-30") == FRESH_TTL
+    assert ttl_for("2025-09-28", today="2025-09-30") == FRESH_TTL
+    assert ttl_for("2025-09-27", today="2025-09-30") == FINAL_TTL
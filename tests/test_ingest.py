@@ -0,0 +1,190 @@
+"""Strumieniowe parsowanie odpowiedzi searchanalytics.query (gsc.ingest) i ponawianie przerwanej strony."""
+
+import io
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from gsc.fetch import HttpTransport, SearchAnalyticsFetcher, TransportError
+from gsc.ingest import ColumnBuilder, TruncatedResponse, parse_response
+
+DIMENSIONS = ("date", "page", "query")
+# wartości, które wyglądają jak fragmenty składni albo mają wielobajtowe znaki
+TRICKY = [
+    ("2025-09-01", "/a", "seo"),
+    ("2025-09-01", '/{"keys": ["x"]}', "keys"),
+    ("2025-09-02", "/{", "keys"),
+    ("2025-09-02", "/zażółć-gęślą-jaźń", "café ☕ 🚀"),
+    ("2025-09-03", "/b}", '"rows": ['),
+    ("2025-09-03", "/c\\", "}{][,:"),
+]
+
+
+def rows(values=TRICKY):
+    return [{"keys": list(keys), "clicks": i, "impressions": 10 * i + 1, "ctr": i / (10 * i + 1), "position": 1.5 + i}
+            for i, keys in enumerate(values)]
+
+
+def payload(rows, indent=None, **extra) -> bytes:
+    return json.dumps({"rows": rows, **extra}, indent=indent, ensure_ascii=False).encode()
+
+
+def expected(rows) -> dict:
+    return {
+        "date": np.array([row["keys"][0] for row in rows], dtype="datetime64[D]"),
+        "page": np.array([row["keys"][1] for row in rows], dtype=object),
+        "query": np.array([row["keys"][2] for row in rows], dtype=object),
+        "clicks": np.array([row["clicks"] for row in rows], dtype=np.int32),
+        "impressions": np.array([row["impressions"] for row in rows], dtype=np.int32),
+        "ctr": np.array([row["ctr"] for row in rows], dtype=np.float32) * 100.0,
+        "position": np.array([row["position"] for row in rows], dtype=np.float32),
+    }
+
+
+def assert_columns(columns, rows):
+    want = expected(rows)
+    assert set(columns) == set(want)
+    for name, values in want.items():
+        np.testing.assert_array_equal(np.asarray(columns[name]), values, err_msg=name)
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_rows_split_at_every_chunk_boundary(indent):
+    data = payload(rows(), indent=indent, responseAggregationType="byPage")
+    for read_size in range(1, len(data) + 1):
+        builder = ColumnBuilder(DIMENSIONS)
+        assert builder.feed(io.BytesIO(data), read_size) == len(TRICKY), read_size
+        assert_columns(builder.columns(), rows())
+
+
+def test_many_rows_in_small_chunks():
+    values = [(f"2025-09-{day:02d}", f"/p{i}/ś", f"q{i % 7} \"cytat\"") for day in range(1, 4) for i in range(500)]
+    builder = ColumnBuilder(DIMENSIONS)
+    builder.feed(io.BytesIO(payload(rows(values))), read_size=97)
+    assert_columns(builder.columns(), rows(values))
+
+
+@pytest.mark.parametrize("data", [b'{"rows": []}', b'{"rows": [], "responseAggregationType": "auto"}',
+                                  b'{"responseAggregationType": "auto"}', b"{}", b""])
+def test_empty_or_missing_rows(data):
+    store = parse_response(io.BytesIO(data), DIMENSIONS)
+    assert len(store) == 0
+    assert set(DIMENSIONS) <= set(store.columns)
+
+
+def test_pages_append_to_one_builder():
+    first, second = rows()[:2], rows()[2:]
+    builder = ColumnBuilder(DIMENSIONS)
+    builder.feed(io.BytesIO(payload(first)), read_size=16)
+    builder.feed(io.BytesIO(payload(second)), read_size=16)
+    assert_columns(builder.columns(), first + second)
+
+
+def test_truncate_drops_interrupted_page():
+    first = rows()[:2]
+    builder = ColumnBuilder(DIMENSIONS)
+    builder.feed(io.BytesIO(payload(first)))
+    size = len(builder)
+    broken = payload(rows())[:-40]
+    with pytest.raises(ValueError):
+        builder.feed(io.BytesIO(broken), read_size=8)
+    builder.truncate(size)
+    builder.feed(io.BytesIO(payload(rows()[2:])))
+    assert_columns(builder.columns(), rows())
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_every_prefix_is_complete_or_truncated(indent):
+    data = payload(rows(), indent=indent, responseAggregationType="byPage")
+    closed = data.rindex(b"]")
+    for size in range(1, len(data)):
+        builder = ColumnBuilder(DIMENSIONS)
+        if size > closed:
+            builder.feed(io.BytesIO(data[:size]), read_size=7)
+            assert_columns(builder.columns(), rows())
+        else:
+            with pytest.raises(TruncatedResponse):
+                builder.feed(io.BytesIO(data[:size]), read_size=7)
+
+
+@pytest.mark.parametrize("data", [
+    b'{"rows": [{"keys": ["2025-09-01", "/a", "q"], "clicks": x}]}',
+    payload(rows() * 50)[:-3] + b"?]}",
+    payload(rows() * 50).replace(b'"clicks": 3', b'"clicks": 3 3', 1),
+    rb'{"rows": [{"keys": ["2025-09-01", "/a", "q\u00"], "clicks": 1}]}',
+    b'{"responseAggregationType": auto}',
+])
+def test_malformed_payload_is_not_truncation(data):
+    with pytest.raises(ValueError) as info:
+        ColumnBuilder(DIMENSIONS).feed(io.BytesIO(data), read_size=64)
+    assert not isinstance(info.value, TruncatedResponse)
+
+
+class FakeGSC(BaseHTTPRequestHandler):
+    """Lokalny serwer: pierwsza odpowiedź na każdą stronę urywa się w połowie treści."""
+
+    pages = {0: rows()[:4], 4: rows()[4:]}
+    served: dict[int, int] = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        start = body["startRow"]
+        attempt = self.served[start] = self.served.get(start, 0) + 1
+        data = self.body(start, attempt)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.wfile.flush()
+        self.close_connection = True
+
+    def body(self, start: int, attempt: int) -> bytes:
+        data = payload(self.pages.get(start, []))
+        return data if attempt > 1 else data[:len(data) // 2]
+
+
+class BrokenGSC(FakeGSC):
+    """Kompletna, ale błędna treść - za każdym razem taka sama."""
+
+    def body(self, start: int, attempt: int) -> bytes:
+        return payload(self.pages.get(start, [])).replace(b'"clicks": 0', b'"clicks": zero')
+
+
+@contextmanager
+def serving(handler):
+    handler.served = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_port}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_page_cut_mid_body_is_retried_without_duplicates():
+    with serving(FakeGSC) as url:
+        fetcher = SearchAnalyticsFetcher(HttpTransport(url, timeout=5), row_limit=4, sleep=lambda seconds: None)
+        columns = fetcher.fetch_chunk("sc-domain:example.com", "2025-09-01", "2025-09-03", DIMENSIONS)
+    assert_columns(columns, rows())
+    assert FakeGSC.served == {0: 2, 4: 2}
+
+
+def test_malformed_page_is_not_retried():
+    waits = []
+    with serving(BrokenGSC) as url:
+        fetcher = SearchAnalyticsFetcher(HttpTransport(url, timeout=5), row_limit=4, sleep=waits.append)
+        with pytest.raises(ValueError) as info:
+            fetcher.fetch_chunk("sc-domain:example.com", "2025-09-01", "2025-09-03", DIMENSIONS)
+    assert not isinstance(info.value, (TruncatedResponse, TransportError))
+    assert BrokenGSC.served == {0: 1}
+    assert not waits
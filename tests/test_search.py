@@ -0,0 +1,36 @@
+"""Indeks trigramowy (gsc.search): wynik zawsze taki sam jak pełne przeszukanie słownika."""
+
+import re
+
+import pytest
+
+from gsc.search import SearchIndex
+
+VOCABULARY = [
+    "Aabc", "aabc", "abc", "xabcx", "seo poradnik", "SEO audyt", "pozycjonowanie stron", "a.b.c",
+    "abc123", "ABC-2025", "café ☕", "cafe", "żółw abc", "\\d+abc", "tab\tabc", "",
+]
+
+PATTERNS = [
+    r"\x41abc", r"\x61bc", r"\u0041abc", r"\U00000041abc", r"\N{LATIN CAPITAL LETTER A}abc", r"\101abc",
+    r"\0", r"abc\d+", r"\dabc", r"a\.b\.c", r"\\d\+abc", r"seo\s+\w+", r"^seo", r"abc$", r"ab?c",
+    r"caf[eé]", r"pozycj.*stron", r"a{2}bc", r"\tabc", r"abc|seo", r"(ab)c",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_regex_matches_full_scan(pattern):
+    index = SearchIndex(VOCABULARY)
+    regex = re.compile(pattern, re.IGNORECASE)
+    want = [i for i, value in enumerate(index.vocabulary) if regex.search(value)]
+    assert index.search(pattern, "regex").tolist() == want
+
+
+@pytest.mark.parametrize("mode", ["contains", "prefix"])
+@pytest.mark.parametrize("needle", ["abc", "SEO", "ab", "café", "zzz", ""])
+def test_substring_modes_match_full_scan(mode, needle):
+    index = SearchIndex(VOCABULARY)
+    lower = needle.lower()
+    want = [i for i, value in enumerate(index.vocabulary)
+            if (value.lower().startswith(lower) if mode == "prefix" else lower in value.lower())]
+    assert index.search(needle, mode).tolist() == want
@@ -0,0 +1,61 @@
+"""Top-K i stronicowanie (gsc.topk): ta sama kolejność co pełne sortowanie, NaN na końcu."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gsc.topk import page_rows, top_k, top_k_indices
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    clicks = rng.permutation(500).astype(np.float64)
+    clicks[rng.choice(500, 40, replace=False)] = np.nan
+    return pd.DataFrame({"page": [f"/p{i}" for i in range(500)], "clicks": clicks})
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("k", [0, 1, 10, 459, 460, 499, 500, 800])
+def test_top_k_matches_full_sort(frame, k, descending):
+    want = frame.sort_values("clicks", ascending=not descending, na_position="last", kind="stable").head(k)
+    pd.testing.assert_frame_equal(top_k(frame, "clicks", k, descending), want)
+
+
+def test_top_k_with_ties_keeps_best_values():
+    values = np.array([3, 1, 3, 2, 3, np.nan, 1])
+    best = top_k_indices(values, 3)
+    assert values[best].tolist() == [3, 3, 3]
+    assert top_k_indices(values, 7)[-1] == 5
+
+
+def test_top_k_within_mask(frame):
+    mask = frame["page"].str.endswith("7").to_numpy()
+    want = frame[mask].sort_values("clicks", ascending=False, na_position="last", kind="stable").head(5)
+    pd.testing.assert_frame_equal(top_k(frame, "clicks", 5, mask=mask), want)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_concatenate_to_full_sort(frame, descending):
+    want = frame.sort_values("clicks", ascending=not descending, na_position="last", kind="stable")
+    pages = []
+    for page in range(11):
+        rows, total = page_rows(frame, "clicks", descending, page=page, page_size=50)
+        assert total == len(frame)
+        pages.append(rows)
+    assert len(pages[-1]) == 0
+    pd.testing.assert_frame_equal(pd.concat(pages), want)
+
+
+def test_pages_with_many_ties_neither_repeat_nor_skip_rows():
+    clicks = np.random.default_rng(3).integers(0, 5, 1000).astype(np.float64)
+    frame = pd.DataFrame({"clicks": clicks})
+    pages = [page_rows(frame, "clicks", page=page, page_size=25)[0] for page in range(40)]
+    pd.testing.assert_frame_equal(pd.concat(pages), frame.sort_values("clicks", ascending=False, kind="stable"))
+
+
+def test_page_total_counts_masked_rows_and_negative_page_is_first(frame):
+    mask = frame["clicks"].to_numpy() > 400
+    rows, total = page_rows(frame, "clicks", page=-3, page_size=20, mask=mask)
+    assert total == int(mask.sum())
+    assert rows["clicks"].tolist() == sorted(frame["clicks"][mask], reverse=True)[:20]
@@ -0,0 +1,111 @@
+"""Synchronizacja hurtowni (gsc.warehouse): tylko brakujące i nieświeże dni, wersja zmienia się tylko przy zmianie."""
+
+import time
+
+import numpy as np
+import pytest
+
+from gsc.fetch import TABLES, SearchAnalyticsFetcher, Transport
+from gsc.warehouse import REFRESH_SECONDS, Warehouse
+
+SITE = "sc-domain:example.com"
+TODAY = np.datetime64("2025-09-30")
+# ostatnie FRESH_DAYS (3) dni przed dzisiaj i dzisiaj są niefinalne
+FRESH = [str(day) for day in np.arange(np.datetime64("2025-09-27"), TODAY + 1)]
+VALUES = {"page": ["/a", "/b"], "query": ["seo"], "country": ["pol"], "device": ["MOBILE"]}
+
+
+class FakeTransport(Transport):
+    """Dwa wiersze dziennie w każdej tabeli; ``clicks[dzień]`` zmienia dane dnia."""
+
+    def __init__(self):
+        self.bodies = []
+        self.clicks = {}
+
+    def query(self, site_url, body):
+        self.bodies.append(body)
+        days = np.arange(np.datetime64(body["startDate"]), np.datetime64(body["endDate"]) + 1).astype(str)
+        rows = [{"keys": [day if name == "date" else VALUES[name][i % len(VALUES[name])]
+                          for name in body["dimensions"]],
+                 "clicks": self.clicks.get(day, 1) + i, "impressions": 10, "ctr": 0.1 * (i + 1), "position": 2.0}
+                for day in days for i in range(2)]
+        return {"rows": rows[body["startRow"]:body["startRow"] + body["rowLimit"]]}
+
+    def days(self, table=None):
+        """Pobrane dni (opcjonalnie jednej tabeli) od ostatniego wyczyszczenia."""
+        dimensions = None if table is None else list(TABLES[table][0])
+        return sorted({str(day) for body in self.bodies if dimensions in (None, body["dimensions"])
+                       for day in np.arange(np.datetime64(body["startDate"]), np.datetime64(body["endDate"]) + 1)})
+
+
+@pytest.fixture
+def setup(tmp_path):
+    transport = FakeTransport()
+    warehouse = Warehouse(tmp_path)
+    fetcher = SearchAnalyticsFetcher(transport, sleep=lambda seconds: None)
+
+    def sync(now, start="2025-09-21", end=TODAY, today=TODAY):
+        transport.bodies.clear()
+        return warehouse.sync(fetcher, SITE, start, end, today=today, now=now)
+
+    return transport, warehouse, sync
+
+
+def test_first_sync_fetches_every_day_once(setup):
+    transport, warehouse, sync = setup
+    assert sync(now=1000.0) == 10 * len(TABLES)
+    # kostka po dniu na wywołanie, tabele usługi jednym kawałkiem
+    assert len(transport.bodies) == 10 + 2
+    assert transport.days() == [str(day) for day in np.arange(np.datetime64("2025-09-21"), TODAY + 1)]
+    for table in TABLES:
+        manifest = warehouse.manifest(SITE, table)
+        assert [day for day, state in manifest.items() if state == "fresh"] == FRESH
+        assert len(warehouse.read(SITE, table)) == 20
+    assert warehouse.version(SITE) > 0
+
+
+def test_sync_within_refresh_interval_calls_nothing(setup):
+    transport, warehouse, sync = setup
+    sync(now=1000.0)
+    version = warehouse.version(SITE)
+    assert sync(now=1000.0 + REFRESH_SECONDS - 1) == 0
+    assert transport.bodies == []
+    assert warehouse.version(SITE) == version
+
+
+def test_refresh_fetches_only_fresh_days_and_keeps_version(setup):
+    transport, warehouse, sync = setup
+    sync(now=1000.0)
+    version = warehouse.version(SITE)
+    assert sync(now=1000.0 + REFRESH_SECONDS + 1) == 0
+    for table in TABLES:
+        assert transport.days(table) == FRESH
+    assert len(transport.bodies) == len(FRESH) + 2
+    assert warehouse.version(SITE) == version
+
+
+def test_changed_fresh_day_moves_version_and_snapshot(setup):
+    transport, warehouse, sync = setup
+    sync(now=1000.0)
+    version = warehouse.version(SITE)
+    before = warehouse.snapshot(SITE, "cube").clicks.sum()
+    transport.clicks["2025-09-29"] = 5
+    # znaczniki czasu plików mają skończoną rozdzielczość
+    time.sleep(0.02)
+    assert sync(now=1000.0 + REFRESH_SECONDS + 1) == len(TABLES)
+    assert warehouse.version(SITE) != version
+    assert warehouse.snapshot(SITE, "cube").clicks.sum() == before + 2 * 4
+
+
+def test_day_leaving_fresh_window_becomes_final(setup):
+    transport, warehouse, sync = setup
+    sync(now=1000.0)
+    tomorrow = TODAY + 1
+    sync(now=1000.0 + 60, start="2025-09-22", end=tomorrow, today=tomorrow)
+    # 27.09 był pobrany przed chwilą, ale wypadł z okna niefinalnych - pobierany jeszcze raz jako finalny
+    for table in TABLES:
+        assert transport.days(table) == ["2025-09-27", str(tomorrow)]
+        manifest = warehouse.manifest(SITE, table)
+        assert manifest["2025-09-27"] == "final"
+        assert manifest[str(tomorrow)] == "fresh"
+        assert "2025-09-27" not in warehouse.refreshed(SITE, table)